@@ -22,23 +22,74 @@ Usage:
 
 import argparse
 import atexit
+import codecs
+import fnmatch
+import functools
+import gzip
+import itertools
 import json
+import mmap
 import os
 import pickle
 import platform
+import re
 import shutil
 import signal
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import threading
+import weakref
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, ClassVar, Iterator, cast
+from typing import IO, Any, ClassVar, Iterable, Iterator, cast
+from urllib.parse import quote
 
 # Global cache dictionary: cache_key -> stdout string
 _cache: dict[str, str] = {}
-# Global PR cache: (repo_path, pr_number) -> PullRequest for closed PRs
-_pr_cache: dict[tuple[str, int], "PullRequest"] = {}
 _cache_dirty: bool = False
+# Guards cache writes from worker threads
+_cache_lock = threading.Lock()
+
+# Co-authored-by trailer parsing (see Commit.co_authors)
+# Candidate line: optional indentation, then "co-authored"
+_COAUTHOR_LINE_RE = re.compile(r"^[^\S\n]*co-authored.*$", re.IGNORECASE | re.MULTILINE)
+# META: "co-authored" optionally "-by", then any colon/whitespace
+_COAUTHOR_META_RE = re.compile(r"^co-authored(?:-by)?[:\s]*", re.IGNORECASE)
+# MAIL: standard-ish email token
+_COAUTHOR_MAIL_RE = re.compile(
+    r"[a-z0-9._\-]+@[a-z0-9\-]+(?:\.[a-z0-9\-]+)*", re.IGNORECASE
+)
+# NAME: first run of name-safe characters (letters, digits, space, hyphen)
+_COAUTHOR_NAME_RE = re.compile(r"[a-z0-9][a-z0-9 \-]*", re.IGNORECASE)
+_MULTI_SPACE_RE = re.compile(r" {2,}")
+
+# Move/copy detection levels for git blame, cheapest first; more detection
+# credits code moved between files but costs more blame time
+BLAME_COPY_DETECTION_LEVELS = ("", "-M", "-M -C", "-M -C -C")
+DEFAULT_BLAME_COPY_DETECTION = "-M -C -C"
+
+# A full (unabbreviated) commit hash
+_COMMIT_HASH_RE = re.compile(r"[0-9a-f]{40}")
+# Larger .json files are not considered as students config candidates
+_STUDENTS_JSON_MAX_SIZE = 16 * 1024 * 1024
+# Unified diff lines that matter for whitespace detection: a "diff --git"
+# header (group 1: the paths), or an added/removed line (not a +++/--- file
+# header) with at least one non-whitespace character
+_DIFF_LINE_RE = re.compile(
+    r"^diff --git ([^\n]*)|^(?:\+(?!\+\+)|-(?!--))[^\n]*\S", re.MULTILINE
+)
+
+# One "git blame --porcelain" entry: commit header line, optional metadata
+# lines, then the tab-prefixed line content
+_BLAME_ENTRY_RE = re.compile(
+    r"^([0-9a-f]{40}) \d+ \d+(?: \d+)?\n(?:[^\t\n][^\n]*\n)*\t([^\n]*)$",
+    re.MULTILINE,
+)
 
 
 class CommitNotFoundError(Exception):
@@ -49,6 +100,10 @@ class CommitNotFoundError(Exception):
         self.repo_path = repo_path
         super().__init__(f"Commit not found: {commit} in {repo_path}")
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuild from the constructor arguments (e.g. across processes)
+        return self.__class__, (self.commit, self.repo_path)
+
 
 class FileNotFoundInRepoError(Exception):
     """Raised when a file cannot be found in the repository at a given commit."""
@@ -61,6 +116,9 @@ class FileNotFoundInRepoError(Exception):
             f"File not found: {file_path} at commit {commit[:8]} in {repo_path}"
         )
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.file_path, self.commit, self.repo_path)
+
 
 class ExecutableNotFoundError(Exception):
     """Raised when an executable command cannot be found."""
@@ -76,6 +134,9 @@ class ExecutableNotFoundError(Exception):
             msg = f"Executable not found: {command}"
         super().__init__(msg)
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (self.command,)
+
 
 class StudentsConfigError(Exception):
     """Raised when the students config file is invalid or cannot be found."""
@@ -109,8 +170,16 @@ class UnknownAuthorError(Exception):
             f"for the matching student in .students.json."
         )
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self.__class__, (
+            self.name,
+            self.email,
+            self.context_type,
+            self.context_detail,
+        )
+
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Author:
     """Represents a Git author."""
 
@@ -121,6 +190,9 @@ class Author:
     other_names: list[str] | None = None
     other_emails: list[str] | None = None
     allow_auto_update: bool = True
+    # Identity key and its hash, computed once (name and email never change)
+    _key: tuple[str, str] = field(init=False, repr=False)
+    _hash: int = field(init=False, repr=False)
 
     # Registry of Author instances, keyed by (name, email)
     _registry: ClassVar[dict[tuple[str, str], "Author"]] = {}
@@ -130,17 +202,31 @@ class Author:
             self.other_names = []
         if self.other_emails is None:
             self.other_emails = []
+        self.name = sys.intern(self.name)
+        self.email = sys.intern(self.email)
+        self._key = (self.name, self.email)
+        self._hash = hash(self._key)
+
+    # String hashes differ between processes, so the derived key and hash
+    # are not pickled but recomputed (e.g. for results from worker processes)
+    def __getstate__(self) -> dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self.__post_init__()
 
     def __str__(self) -> str:
         return f"{self.name} <{self.email}>"
 
     def __hash__(self) -> int:
-        return hash((self.name, self.email))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Author):
             return NotImplemented
-        return self.name == other.name and self.email == other.email
+        return self._key == other._key
 
     @staticmethod
     def get(
@@ -168,15 +254,15 @@ class Author:
         Raises:
             UnknownAuthorError: If the author is not in the registry
         """
-        key = (name, email)
-        if key not in Author._registry:
+        author = Author._registry.get((name, email))
+        if author is None:
             raise UnknownAuthorError(
                 name=name,
                 email=email,
                 context_type=context_type,
                 context_detail=context_detail,
             )
-        return Author._registry[key]
+        return author
 
     @staticmethod
     def clear_registry() -> None:
@@ -197,10 +283,7 @@ class Author:
         Returns:
             The registered Author instance (may be different from input if already existed)
         """
-        key = (author.name, author.email)
-        if key not in Author._registry:
-            Author._registry[key] = author
-        return Author._registry[key]
+        return Author._registry.setdefault(author._key, author)
 
     @staticmethod
     def register_with_aliases(author: "Author") -> "Author":
@@ -223,17 +306,16 @@ class Author:
         """
         # Register the primary identity
         registered = Author.register(author)
+        if not author.other_names and not author.other_emails:
+            return registered
 
         # All names and emails to register
         all_names = [author.name] + (author.other_names or [])
         all_emails = [author.email] + (author.other_emails or [])
 
         # Register all combinations
-        for name in all_names:
-            for email in all_emails:
-                key = (name, email)
-                if key not in Author._registry:
-                    Author._registry[key] = registered
+        for key in itertools.product(all_names, all_emails):
+            Author._registry.setdefault(key, registered)
 
         return registered
 
@@ -268,6 +350,11 @@ class PullRequestFile:
     deletions: int
     has_non_whitespace_changes: bool = True  # Default True, set by diff parsing
 
+    def __post_init__(self) -> None:
+        # The same paths recur across many PRs; share one string per path
+        # (also lets pickle store each path once in the PR cache)
+        self.path = sys.intern(self.path)
+
 
 @dataclass
 class PullRequest:
@@ -311,6 +398,29 @@ class PullRequest:
         """Get set of usernames who authored commits in this PR."""
         return {c.author_username for c in self.commits if c.author_username}
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PullRequest":
+        """
+        Rebuild a PullRequest from the output of dataclasses.asdict.
+
+        Args:
+            data: Dictionary with the PullRequest fields
+
+        Returns:
+            PullRequest instance
+        """
+        return cls(
+            number=data["number"],
+            author_username=data["author_username"],
+            created_at=data["created_at"],
+            state=data["state"],
+            merged_at=data["merged_at"],
+            merged_by_username=data["merged_by_username"],
+            commits=[PullRequestCommit(**c) for c in data["commits"]],
+            reviews=[PullRequestReview(**r) for r in data["reviews"]],
+            files=[PullRequestFile(**f) for f in data["files"]],
+        )
+
 
 @dataclass
 class GitHubStats:
@@ -335,6 +445,12 @@ class StudentsConfig:
     ignore: list[Author]
     include_patterns: list[str]
     exclude_patterns: list[str]
+    blame_copy_detection: str = DEFAULT_BLAME_COPY_DETECTION
+
+    @functools.cached_property
+    def username_to_author(self) -> dict[str, Author]:
+        """Mapping from lowercased GitHub username to student."""
+        return {s.github_username.lower(): s for s in self.students}
 
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "StudentsConfig":  # noqa: C901
@@ -440,14 +556,74 @@ class StudentsConfig:
                 str(p) for p in cast(list[Any], files_config["exclude"])
             ]
 
+        # Parse git blame move/copy detection level
+        blame_copy_detection = data.get(
+            "blame_copy_detection", DEFAULT_BLAME_COPY_DETECTION
+        )
+        if blame_copy_detection not in BLAME_COPY_DETECTION_LEVELS:
+            levels = ", ".join(f"'{level}'" for level in BLAME_COPY_DETECTION_LEVELS)
+            raise StudentsConfigError(
+                f"'blame_copy_detection' must be one of: {levels}"
+            )
+
         return StudentsConfig(
             students=students,
             ignore=ignore,
             include_patterns=include_patterns,
             exclude_patterns=exclude_patterns,
+            blame_copy_detection=blame_copy_detection,
         )
 
 
+def _parse_ident(ident: str) -> tuple[str, str, str]:
+    """
+    Parse a raw commit object identity ("Name <email> timestamp tz").
+
+    Args:
+        ident: The identity part of an author/committer header line
+
+    Returns:
+        Tuple of (name, email, date as YYYY-MM-DD in the identity's timezone)
+    """
+    person, _, when = ident.rpartition("> ")
+    name, _, email = person.partition(" <")
+    timestamp, _, tz = when.partition(" ")
+    try:
+        offset = int(tz[1:3]) * 60 + int(tz[3:5])
+        if tz.startswith("-"):
+            offset = -offset
+        moment = datetime.fromtimestamp(
+            int(timestamp), timezone(timedelta(minutes=offset))
+        )
+        date = moment.date().isoformat()
+    except (ValueError, OverflowError):
+        date = ""
+    return name, email, date
+
+
+def _decode_commit_object(payload: bytes) -> str:
+    """
+    Decode a raw commit object, like "git show" re-encoding it to UTF-8.
+
+    Args:
+        payload: The raw commit object
+
+    Returns:
+        The object decoded with the codec named in its "encoding" header
+        (UTF-8 if there is none, or it is unknown)
+    """
+    headers = payload.split(b"\n\n", 1)[0]
+    encoding = "utf-8"
+    for header in headers.split(b"\n"):
+        if header.startswith(b"encoding "):
+            encoding = header[9:].decode("ascii", errors="replace").strip()
+            break
+    try:
+        return payload.decode(encoding, errors="replace")
+    except LookupError:
+        return payload.decode("utf-8", errors="replace")
+
+
 @dataclass
 class Commit:
     """Represents a git commit."""
@@ -455,7 +631,16 @@ class Commit:
     hash: str
     author: Author
     date: str
-    message_lines: list[str]
+    message_body: str  # Full message, without trailing line breaks
+
+    def __hash__(self) -> int:
+        # Commits are identified by their hash
+        return hash(self.hash)
+
+    @property
+    def subject(self) -> str:
+        """Get the first line of the commit message."""
+        return self.message_body.partition("\n")[0].rstrip("\r")
 
     @staticmethod
     def get(commit_hash: str, repo: "Repo") -> "Commit":
@@ -467,39 +652,42 @@ class Commit:
             repo: The Repo instance
 
         Returns:
-            Commit instance with hash and message lines
+            Commit instance with hash, author, date and message
 
         Raises:
             CommitNotFoundError: If the commit does not exist
         """
-        # Resolve to full hash
-        try:
-            resolved_hash = git(
-                "-C",
-                str(repo.path),
-                "rev-parse",
-                commit_hash,
-                cache_key=f"rev-parse:{repo.repo_id}:{commit_hash}",
-            ).strip()
-        except subprocess.CalledProcessError:
-            raise CommitNotFoundError(commit_hash, repo.path)
+        global _cache_dirty
 
-        # Get commit info with author details
-        # Format: author_name%n author_email%n date%n message_body
-        stdout = git(
-            "-C",
-            str(repo.path),
-            "show",
-            "-s",
-            "--format=%aN%n%aE%n%as%n%B",
-            resolved_hash,
-            cache_key=f"commit:{resolved_hash}",
-        )
+        # Short hashes and refs go through the shared rev-parse path, so that
+        # commit objects are only ever cached under their full hash
+        if not _COMMIT_HASH_RE.fullmatch(commit_hash):
+            commit_hash = repo.rev_parse(commit_hash)
 
-        lines = stdout.splitlines()
-        author_name = lines[0] if len(lines) > 0 else ""
-        author_email = lines[1] if len(lines) > 1 else ""
-        commit_date = lines[2] if len(lines) > 2 else ""
+        # Read the raw commit object through the repo's persistent cat-file
+        # process (cached decoded, before any mailmap rewrite)
+        cache_key = f"commit-object:{repo.repo_id}:{commit_hash}"
+        if cache_key in _cache:
+            resolved_hash, _, raw = _cache[cache_key].partition("\n")
+        else:
+            resolved_hash, object_type, payload = repo.resolve_and_read(commit_hash)
+            if object_type != "commit":
+                raise CommitNotFoundError(commit_hash, repo.path)
+            raw = _decode_commit_object(payload)
+            with _cache_lock:
+                _cache[cache_key] = f"{resolved_hash}\n{raw}"
+                _cache_dirty = True
+
+        # Raw commit object: header lines, a blank line, then the message
+        headers, _, message = raw.partition("\n\n")
+        author_name = ""
+        author_email = ""
+        commit_date = ""
+        for header in headers.split("\n"):
+            if header.startswith("author "):
+                author_name, author_email, commit_date = _parse_ident(header[7:])
+                author_name, author_email = repo.map_ident(author_name, author_email)
+                break
         author = Author.get(
             name=author_name,
             email=author_email,
@@ -507,21 +695,20 @@ class Commit:
             context_detail=resolved_hash[:8],
         )
 
-        # Message starts at line 3
-        message_lines = lines[3:] if len(lines) > 3 else []
-        while message_lines and not message_lines[-1]:
-            message_lines.pop()
-
         return Commit(
             hash=resolved_hash,
             author=author,
             date=commit_date,
-            message_lines=message_lines,
+            message_body=message.rstrip("\r\n"),
         )
 
-    def get_co_authors(self) -> list[Author]:
+    @functools.cached_property
+    def co_authors(self) -> list[Author]:
         r"""
-        Parse Co-authored-by trailers from the commit message.
+        Co-authors parsed from the commit message's Co-authored-by trailers.
+
+        Parsed on first access and kept on the instance; there is one Commit
+        instance per hash, so each message is parsed once.
 
         Follows GitHub's format for commits with multiple authors:
         https://docs.github.com/en/pull-requests/committing-changes-to-your-project/creating-and-editing-commits/creating-a-commit-with-multiple-authors
@@ -537,33 +724,20 @@ class Commit:
         This is intentionally forgiving: extra characters around the email (angle
         brackets, punctuation) or extra spaces in the name are silently ignored.
 
-        Returns:
-            List of Author instances parsed from Co-authored-by lines, or empty list
+        An empty list if there are no Co-authored-by lines.
         """
-        import re
-
         co_authors: list[Author] = []
 
-        # META: "co-authored" optionally "-by", then any colon/whitespace
-        meta_re = re.compile(r"^co-authored(?:-by)?[:\s]*", re.IGNORECASE)
-
-        # MAIL: standard-ish email token
-        mail_re = re.compile(
-            r"[a-z0-9._\-]+@[a-z0-9\-]+(?:\.[a-z0-9\-]+)*", re.IGNORECASE
-        )
-
-        # NAME: first run of name-safe characters (letters, digits, space, hyphen)
-        name_re = re.compile(r"[a-z0-9][a-z0-9 \-]*", re.IGNORECASE)
-
-        for line in self.message_lines:
-            stripped = line.strip()
+        # Only lines that can carry a trailer are looked at
+        for line_match in _COAUTHOR_LINE_RE.finditer(self.message_body):
+            stripped = line_match.group(0).strip()
 
-            meta_match = meta_re.match(stripped)
+            meta_match = _COAUTHOR_META_RE.match(stripped)
             if not meta_match:
                 continue
 
             # Find the rightmost valid email on the line
-            mail_matches = list(mail_re.finditer(stripped))
+            mail_matches = list(_COAUTHOR_MAIL_RE.finditer(stripped))
             if not mail_matches:
                 continue
             mail_match = mail_matches[-1]
@@ -575,10 +749,10 @@ class Commit:
             mail_end = mail_match.end() - meta_match.end()
             name_source = after_meta[:mail_start] + after_meta[mail_end:]
 
-            name_match = name_re.search(name_source)
+            name_match = _COAUTHOR_NAME_RE.search(name_source)
             if not name_match:
                 continue
-            name = re.sub(r" {2,}", " ", name_match.group(0)).strip()
+            name = _MULTI_SPACE_RE.sub(" ", name_match.group(0)).strip()
 
             if name and email:
                 co_authors.append(
@@ -593,16 +767,154 @@ class Commit:
         return co_authors
 
 
+def _glob_part_regex(part: str) -> str:
+    """Translate a single glob path component into a regex fragment."""
+    regex = ""
+    i, n = 0, len(part)
+    while i < n:
+        c = part[i]
+        i += 1
+        if c == "*":
+            regex += "[^/]*"
+        elif c == "?":
+            regex += "[^/]"
+        elif c == "[":
+            j = i
+            if j < n and part[j] == "!":
+                j += 1
+            if j < n and part[j] == "]":
+                j += 1
+            while j < n and part[j] != "]":
+                j += 1
+            if j >= n:
+                regex += "\\["
+                continue
+            # Let fnmatch translate the bracket expression, so "[!...]",
+            # reversed ranges and set operators are handled exactly like
+            # Path.glob() does; negated classes must not match "/" either
+            # (its result is the regex wrapped as "(?s:...)\Z")
+            translated = fnmatch.translate(part[i - 1 : j + 1])
+            bracket = translated.removeprefix("(?s:").rpartition(")")[0]
+            i = j + 1
+            if bracket == ".":
+                regex += "[^/]"
+            elif bracket.startswith("[^"):
+                regex += f"(?!/){bracket}"
+            else:
+                regex += bracket
+        else:
+            regex += re.escape(c)
+    return regex
+
+
+@functools.lru_cache(maxsize=256)
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    """
+    Compile a glob pattern into a regex matching repo-relative file paths.
+
+    Follows Path.glob() semantics: "*", "?" and "[...]" never match "/",
+    and a "**" component matches zero or more directories.
+
+    Args:
+        pattern: Glob pattern (e.g., "*.py", "src/**/*.java")
+
+    Returns:
+        Compiled regex to use with .match() on POSIX-style paths
+
+    Raises:
+        ValueError: If "**" is used as part of a path component
+    """
+    parts = [p for p in pattern.split("/") if p and p != "."]
+    regex = ""
+    for i, part in enumerate(parts):
+        if part == "**":
+            if i == len(parts) - 1:
+                # A trailing "**" only matches directories
+                return re.compile("(?!)")
+            regex += "(?:[^/]+/)*"
+        elif "**" in part:
+            raise ValueError(
+                "Invalid pattern: '**' can only be an entire path component"
+            )
+        else:
+            regex += _glob_part_regex(part)
+            if i < len(parts) - 1:
+                regex += "/"
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile(regex + r"\Z", flags)
+
+
+def _compile_globset(
+    patterns: Iterable[str], root_level: bool = False
+) -> re.Pattern[str] | None:
+    """
+    Compile fnmatch-style patterns into a single regex.
+
+    The patterns become one alternation of their fnmatch translations, so a
+    path is tested against all of them in one match call instead of one
+    fnmatch call (and cache lookup) per pattern. As with fnmatch.fnmatch,
+    paths must be passed through os.path.normcase before matching.
+
+    Args:
+        patterns: fnmatch-style patterns
+        root_level: Also let a "**/" prefix match root-level files
+            (Path.glob behaviour)
+
+    Returns:
+        The compiled regex, or None if there are no patterns
+    """
+    regexes: list[str] = []
+    for pattern in patterns:
+        regexes.append(fnmatch.translate(os.path.normcase(pattern)))
+        if root_level and pattern.startswith("**/"):
+            regexes.append(fnmatch.translate(os.path.normcase(pattern[3:])))
+    return re.compile("|".join(regexes)) if regexes else None
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_patterns(
+    include_patterns: tuple[str, ...],
+    exclude_patterns: tuple[str, ...],
+    root_level: bool = False,
+) -> tuple[re.Pattern[str] | None, re.Pattern[str] | None]:
+    """
+    Compile include and exclude patterns into one regex each.
+
+    Results are cached, so every pass filtering by the same patterns shares
+    the compiled regexes.
+
+    Args:
+        include_patterns: fnmatch-style patterns for files to include
+        exclude_patterns: fnmatch-style patterns for files to exclude
+        root_level: Also let a "**/" prefix match root-level files
+            (Path.glob behaviour)
+
+    Returns:
+        (include regex, exclude regex), each None if there are no patterns
+    """
+    return (
+        _compile_globset(include_patterns, root_level),
+        _compile_globset(exclude_patterns, root_level),
+    )
+
+
 @dataclass
 class TrackedFile:
     """Represents a versioned file in the Git repository with blame information."""
 
     path: str
-    lines: list[tuple[Commit, str]]
+    # Per-line columns: index into Repo.commit_table, the line content, and
+    # 1 if the content has non-whitespace characters (else 0)
+    commit_ids: list[int]
+    contents: list[str]
+    non_whitespace: "array[int]"
 
     @staticmethod
     def files(
-        pattern: str, repo: "Repo", commit: str = "HEAD"
+        pattern: str,
+        repo: "Repo",
+        commit: str = "HEAD",
+        copy_detection: str = DEFAULT_BLAME_COPY_DETECTION,
     ) -> Iterator["TrackedFile"]:
         """
         Yield TrackedFile instances matching a glob pattern.
@@ -611,38 +923,28 @@ class TrackedFile:
             pattern: Glob pattern to match files (e.g., "*.py", "src/**/*.java")
             repo: The Repo instance to search in
             commit: The commit hash to get files at (default: HEAD)
+            copy_detection: Move/copy detection flags for git blame (default: "-M -C -C")
 
         Yields:
             TrackedFile instances for each matching file
         """
-        # Get list of files tracked by git at this commit
-        stdout = git(
-            "-C",
-            str(repo.path),
-            "-c",
-            "core.quotePath=false",
-            "ls-tree",
-            "-r",
-            "--name-only",
-            commit,
-            cache_key=f"ls-tree:{repo.repo_id}:{commit}",
-        )
-        tracked_files = set(stdout.splitlines())
-
-        # Use Python's Path.glob() for correct cross-platform ** handling,
-        # then intersect with tracked files so untracked files are excluded.
-        from pathlib import Path
-
-        repo_path = Path(repo.path)
-        for matched in repo_path.glob(pattern):
-            if not matched.is_file():
-                continue
-            rel_path = matched.relative_to(repo_path).as_posix()
-            if rel_path in tracked_files:
-                yield TrackedFile.get(rel_path, repo, commit)
+        # Match against files tracked by git at this commit, so untracked
+        # files are excluded; require them on disk like Path.glob() did
+        regex = _glob_regex(pattern)
+        paths = [
+            rel_path
+            for rel_path in repo.tracked_paths(commit)
+            if regex.match(rel_path) and (repo.path / rel_path).is_file()
+        ]
+        yield from repo.blame_many(paths, commit, copy_detection)
 
     @staticmethod
-    def get(file_path: str, repo: "Repo", commit: str = "HEAD") -> "TrackedFile":
+    def get(
+        file_path: str,
+        repo: "Repo",
+        commit: str = "HEAD",
+        copy_detection: str = DEFAULT_BLAME_COPY_DETECTION,
+    ) -> "TrackedFile":
         """
         Get a tracked file with blame information at a specific commit.
 
@@ -650,68 +952,86 @@ class TrackedFile:
             file_path: Path to the file (relative to repository root)
             repo: The Repo instance
             commit: The commit hash to get the file at (default: HEAD)
+            copy_detection: Move/copy detection flags for git blame (default: "-M -C -C")
 
         Returns:
-            TrackedFile instance containing the path and list of (Commit, line_content) tuples
+            TrackedFile instance containing the path and per-line commits and contents
 
         Raises:
             CommitNotFoundError: If the commit does not exist
             FileNotFoundInRepoError: If the file does not exist at the given commit
         """
-        # Resolve commit to full hash for consistent caching
-        try:
-            resolved_commit = git(
-                "-C",
-                str(repo.path),
-                "rev-parse",
-                commit,
-                cache_key=f"rev-parse:{repo.repo_id}:{commit}",
-            ).strip()
-        except subprocess.CalledProcessError:
-            raise CommitNotFoundError(commit, repo.path)
+        resolved_commit = repo.rev_parse(commit)
+        stdout = repo.blame(file_path, resolved_commit, copy_detection)
+        return TrackedFile.from_porcelain(file_path, stdout, repo)
 
-        try:
-            stdout = git(
-                "-C",
-                str(repo.path),
-                "blame",
-                "--porcelain",
-                "-M",
-                "-C",
-                "-C",
-                resolved_commit,
-                "--",
-                file_path,
-                cache_key=f"blame:{resolved_commit}:{file_path}",
-            )
-        except subprocess.CalledProcessError as e:
-            stderr = (
-                e.stderr.decode("utf-8", errors="replace")
-                if isinstance(e.stderr, bytes)
-                else e.stderr
-            )
-            if "no such path" in stderr.lower() or "fatal:" in stderr.lower():
-                raise FileNotFoundInRepoError(file_path, resolved_commit, repo.path)
-            raise
+    @staticmethod
+    def from_porcelain(file_path: str, stdout: str, repo: "Repo") -> "TrackedFile":
+        """
+        Build a TrackedFile from "git blame --porcelain" output.
 
-        lines: list[tuple[Commit, str]] = []
-        current_hash: str | None = None
-        commit_cache: dict[str, Commit] = {}
+        Args:
+            file_path: Path to the file (relative to repository root)
+            stdout: The porcelain blame output for the file
+            repo: The Repo instance used to look up commits
+
+        Returns:
+            TrackedFile instance containing the path and per-line commits and contents
+        """
+        commit_ids: list[int] = []
+        contents: list[str] = []
+        non_whitespace = array("b")
+
+        for match in _BLAME_ENTRY_RE.finditer(stdout):
+            commit_hash, content = match.groups()
+            commit_ids.append(repo.commit_id(commit_hash))
+            contents.append(content)
+            # Same test as content.strip() != "", without building a copy
+            non_whitespace.append(bool(content) and not content.isspace())
+
+        return TrackedFile(
+            path=file_path,
+            commit_ids=commit_ids,
+            contents=contents,
+            non_whitespace=non_whitespace,
+        )
 
-        for line in stdout.splitlines():
-            # Lines starting with a commit hash (40 hex chars) followed by line numbers
-            if len(line) >= 40 and all(c in "0123456789abcdef" for c in line[:40]):
-                current_hash = line[:40]
-            # Lines starting with a tab contain the actual file content
-            elif line.startswith("\t"):
-                if current_hash is not None:
-                    content = line[1:]  # Remove the leading tab
-                    # Cache commits to avoid repeated git show calls
-                    if current_hash not in commit_cache:
-                        commit_cache[current_hash] = repo.get_commit(current_hash)
-                    lines.append((commit_cache[current_hash], content))
 
-        return TrackedFile(path=file_path, lines=lines)
+# Environment passed to git: only what git reads (locations of config and
+# temporary files, locale, identity), plus what the dynamic loader needs to
+# start a git installed under a non-standard prefix, instead of the whole
+# parent environment
+_GIT_ENV_KEYS = (
+    "PATH",
+    "HOME",
+    "USER",
+    "LANG",
+    "TZ",
+    "TMPDIR",
+    "XDG_CONFIG_HOME",
+    "LD_LIBRARY_PATH",
+    "LD_PRELOAD",
+    # Windows
+    "SYSTEMROOT",
+    "USERPROFILE",
+    "HOMEDRIVE",
+    "HOMEPATH",
+    "APPDATA",
+    "TEMP",
+    "TMP",
+    "COMSPEC",
+    "PATHEXT",
+)
+_GIT_ENV_PREFIXES = ("GIT_", "LC_", "DYLD_")
+
+
+def _git_env() -> dict[str, str]:
+    """Build the environment for git from the current os.environ."""
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key in _GIT_ENV_KEYS or key.startswith(_GIT_ENV_PREFIXES)
+    }
 
 
 class Executable:
@@ -741,13 +1061,22 @@ class Executable:
     def __repr__(self) -> str:
         return f"Executable({self.command!r}, path={self.path!r})"
 
-    def __call__(self, *args: str, cache_key: str) -> str:
+    @property
+    def env(self) -> dict[str, str] | None:
+        """Environment for the child process (None inherits os.environ)."""
+        # Built per call, so later changes to os.environ are picked up
+        return _git_env() if self.command == "git" else None
+
+    def __call__(self, *args: str, cache_key: str, large: bool = False) -> str:
         """
         Execute the command with the given arguments.
 
         Args:
             *args: Arguments to pass to the command
             cache_key: Key to use for caching the result
+            large: Send stdout to a temporary file and decode it from a memory
+                map, instead of collecting it through a pipe (for outputs of
+                many megabytes)
 
         Returns:
             The stdout from the command (cached or fresh)
@@ -760,16 +1089,35 @@ class Executable:
 
         # Execute the command
         exec_args = [self.path] + list(args)
-        result = subprocess.run(
-            exec_args,
-            capture_output=True,
-            check=True,
-        )
+        stdout: str
+        if large:
+            with tempfile.TemporaryFile() as out:
+                subprocess.run(
+                    exec_args,
+                    stdout=out,
+                    stderr=subprocess.PIPE,
+                    check=True,
+                    env=self.env,
+                )
+                if os.fstat(out.fileno()).st_size == 0:
+                    stdout = ""
+                else:
+                    with mmap.mmap(out.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                        # Decode with replacement for binary content
+                        stdout = str(m, "utf-8", errors="replace")
+        else:
+            result = subprocess.run(
+                exec_args,
+                capture_output=True,
+                check=True,
+                env=self.env,
+            )
 
-        # Decode stdout with replacement for binary content
-        stdout: str = result.stdout.decode("utf-8", errors="replace")
-        _cache[cache_key] = stdout
-        _cache_dirty = True
+            # Decode stdout with replacement for binary content
+            stdout = result.stdout.decode("utf-8", errors="replace")
+        with _cache_lock:
+            _cache[cache_key] = stdout
+            _cache_dirty = True
 
         return stdout
 
@@ -778,6 +1126,41 @@ class Executable:
 git = Executable("git")
 
 
+def _close_repo(repo_ref: "weakref.ref[Repo]") -> None:
+    """Exit hook: close a Repo's persistent processes if it still exists."""
+    repo = repo_ref()
+    if repo is not None:
+        repo.close()
+
+
+def _non_whitespace_diff_files(diff_output: str) -> set[str]:
+    """
+    Find the files in a unified diff whose changed lines are not all whitespace.
+
+    Args:
+        diff_output: Output of "git show -p" or "git log -p" for one commit
+
+    Returns:
+        Set of file paths with non-whitespace changes
+    """
+    files_with_changes: set[str] = set()
+    current_file: str | None = None
+
+    for match in _DIFF_LINE_RE.finditer(diff_output):
+        header = match.group(1)
+        if header is not None:
+            # File header: diff --git a/path b/path
+            parts = header.split(" ")
+            if len(parts) >= 2:
+                b_path = parts[1]
+                current_file = b_path[2:] if b_path.startswith("b/") else b_path
+        elif current_file:
+            # Added/removed line with non-whitespace content
+            files_with_changes.add(current_file)
+
+    return files_with_changes
+
+
 class Repo:
     """
     Represents a Git/GitHub repository.
@@ -802,16 +1185,41 @@ class Repo:
         self._students_config_path = None
         self._repo_id = None
         self._pull_requests: list[PullRequest] | None = None
+        # Commits read so far, by first use; TrackedFile.commit_ids index into it
+        self.commit_table: list[Commit] = []
+        self._commit_ids: dict[str, int] = {}
+        # Paths tracked at a commit, keyed by full commit hash
+        self._tree_cache: dict[str, list[str]] = {}
+        # Paths changed between two commits, keyed by (old, new) commit hash
+        self._changed_paths_cache: dict[tuple[str, str], set[str] | None] = {}
+        # Whether one commit is an ancestor of another, keyed by (old, new)
+        self._is_ancestor_cache: dict[tuple[str, str], bool] = {}
+        self._changed_paths_lock = threading.Lock()
+        # Persistent "git cat-file" processes, keyed by batch mode
+        self._cat_file_procs: dict[str, subprocess.Popen[bytes]] = {}
+        # Persistent "git check-mailmap --stdin" process, and its answers by
+        # (name, email)
+        self._mailmap_proc: subprocess.Popen[bytes] | None = None
+        self._mailmap: dict[tuple[str, str], tuple[str, str]] = {}
+        # Exit hook shutting those processes down, while any are running
+        self._close_hook: "functools.partial[None] | None" = None
 
         # Verify this is a valid git repository
         if not self.path.exists():
             raise ValueError(f"Path does not exist: {self.path}")
 
+        # A ".git" directory (or gitfile, for worktrees and submodules) here or
+        # in a parent is what git itself looks for; only ask git when there is
+        # none, e.g. for bare repositories or GIT_DIR set in the environment
+        if any((p / ".git").exists() for p in (self.path, *self.path.parents)):
+            return
+
         try:
             subprocess.run(
-                ["git", "-C", str(self.path), "rev-parse", "--git-dir"],
+                [git.path, "-C", str(self.path), "rev-parse", "--git-dir"],
                 capture_output=True,
                 check=True,
+                env=git.env,
             )
         except subprocess.CalledProcessError as e:
             raise ValueError(f"Not a valid git repository: {self.path}") from e
@@ -833,9 +1241,10 @@ class Repo:
         if self._repo_id is None:
             try:
                 result = subprocess.run(
-                    ["git", "-C", str(self.path), "remote", "get-url", "origin"],
+                    [git.path, "-C", str(self.path), "remote", "get-url", "origin"],
                     capture_output=True,
                     check=True,
+                    env=git.env,
                 )
                 remote_url = result.stdout.decode("utf-8").strip()
                 # Extract repo identifier from URL (e.g., "org/repo" from git@github.com:org/repo.git)
@@ -854,50 +1263,502 @@ class Repo:
                 self._repo_id = self.path.name
         return self._repo_id
 
+    def _cat_file(self, mode: str) -> "subprocess.Popen[bytes]":
+        """
+        Get the persistent "git cat-file" process for a batch mode.
+
+        The process is spawned on first use and kept alive for the lifetime
+        of the Repo, so each object lookup costs a pipe round trip instead
+        of a fork/exec.
+
+        Args:
+            mode: The batch option, e.g. "--batch" or "--batch-check=%(objectname)"
+
+        Returns:
+            The running cat-file process
+        """
+        proc = self._cat_file_procs.get(mode)
+        if proc is None:
+            args = [git.path, "-C", str(self.path), "cat-file", mode]
+            self._register_close()
+            proc = subprocess.Popen(
+                args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=git.env,
+            )
+            self._cat_file_procs[mode] = proc
+        return proc
+
+    def _cat_file_request(self, mode: str, rev: str) -> tuple[bytes, IO[bytes]]:
+        """
+        Send one revision to a cat-file process and read its header line.
+
+        Args:
+            mode: The batch option of the process to use
+            rev: The revision to look up
+
+        Returns:
+            Tuple of (header line without newline, stdout to read payload from)
+
+        Raises:
+            subprocess.CalledProcessError: If the cat-file process died
+        """
+        proc = self._cat_file(mode)
+        stdin = cast(IO[bytes], proc.stdin)
+        stdout = cast(IO[bytes], proc.stdout)
+        try:
+            stdin.write(rev.encode("utf-8") + b"\n")
+            stdin.flush()
+            header = stdout.readline()
+        except BrokenPipeError:
+            header = b""
+        if not header:
+            del self._cat_file_procs[mode]
+            proc.wait()
+            raise subprocess.CalledProcessError(
+                proc.returncode, cast(list[str], proc.args)
+            )
+        return header.rstrip(b"\n"), stdout
+
+    def resolve_and_read(self, rev: str) -> tuple[str, str, bytes]:
+        """
+        Resolve a revision and read its raw object in one round trip.
+
+        Args:
+            rev: The revision to read (full or short hash, or any ref)
+
+        Returns:
+            Tuple of (full object hash, object type, raw object content)
+
+        Raises:
+            CommitNotFoundError: If the revision cannot be resolved
+        """
+        header, stdout = self._cat_file_request("--batch", rev)
+        parts = header.split(b" ")
+        if len(parts) != 3:
+            # "<rev> missing" or "<rev> ambiguous"
+            raise CommitNotFoundError(rev, self.path)
+        size = int(parts[2])
+        payload = stdout.read(size + 1)[:size]
+        return parts[0].decode("ascii"), parts[1].decode("ascii"), payload
+
+    def map_ident(self, name: str, email: str) -> tuple[str, str]:
+        """
+        Map an identity through the repository's mailmap.
+
+        Mirrors the %aN/%aE handling of "git show". Lookups go through a
+        persistent "git check-mailmap --stdin" process and are remembered.
+        (cat-file --use-mailmap is not used: before git 2.42 its headers
+        report the object size from before the mailmap rewrite.)
+
+        Args:
+            name: The name from a raw commit object
+            email: The email from a raw commit object
+
+        Returns:
+            Tuple of (mapped name, mapped email); unchanged if unmapped
+        """
+        key = (name, email)
+        mapped = self._mailmap.get(key)
+        if mapped is not None:
+            return mapped
+
+        mapped = key
+        if self._mailmap_proc is None:
+            self._register_close()
+            self._mailmap_proc = subprocess.Popen(
+                [git.path, "-C", str(self.path), "check-mailmap", "--stdin"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=git.env,
+            )
+        proc = self._mailmap_proc
+        stdin = cast(IO[bytes], proc.stdin)
+        stdout = cast(IO[bytes], proc.stdout)
+        try:
+            stdin.write(f"{name} <{email}>\n".encode("utf-8"))
+            stdin.flush()
+            line = stdout.readline().decode("utf-8", errors="replace")
+        except BrokenPipeError:
+            line = ""
+        if line.endswith(">\n") and "<" in line:
+            # "Name <email>", or "<email>" without a name
+            person, _, mapped_email = line[:-2].rpartition("<")
+            mapped = (person.rstrip(" "), mapped_email)
+        else:
+            # The contact couldn't be parsed and check-mailmap exited; keep
+            # the identity as is, and start a new process next time
+            self._mailmap_proc = None
+            proc.wait()
+
+        self._mailmap[key] = mapped
+        return mapped
+
+    def resolve(self, rev: str) -> str:
+        """
+        Resolve a revision to its full object hash.
+
+        Args:
+            rev: The revision to resolve (full or short hash, or any ref)
+
+        Returns:
+            The full object hash
+
+        Raises:
+            CommitNotFoundError: If the revision cannot be resolved
+        """
+        header, _ = self._cat_file_request("--batch-check=%(objectname)", rev)
+        if b" " in header:
+            raise CommitNotFoundError(rev, self.path)
+        return header.decode("ascii")
+
+    def rev_parse(self, ref: str) -> str:
+        """
+        Resolve a ref to a full commit hash, using the cache for full hashes.
+
+        Args:
+            ref: The ref to resolve (full or short hash, or any ref)
+
+        Returns:
+            The full commit hash
+
+        Raises:
+            CommitNotFoundError: If the ref cannot be resolved
+        """
+        global _cache_dirty
+
+        # Only full hashes resolve the same way forever; refs such as HEAD
+        # move between runs and must be resolved fresh
+        if not _COMMIT_HASH_RE.fullmatch(ref):
+            return self.resolve(ref)
+
+        cache_key = f"rev-parse:{self.repo_id}:{ref}"
+        if cache_key in _cache:
+            return _cache[cache_key]
+        resolved = self.resolve(ref)
+        with _cache_lock:
+            _cache[cache_key] = resolved
+            _cache_dirty = True
+        return resolved
+
+    def blame(
+        self,
+        file_path: str,
+        commit: str,
+        copy_detection: str = DEFAULT_BLAME_COPY_DETECTION,
+    ) -> str:
+        """
+        Run "git blame --porcelain" with move/copy detection on a file.
+
+        Args:
+            file_path: Path to the file (relative to repository root)
+            commit: The full commit hash to blame at
+            copy_detection: Move/copy detection flags for git blame (default: "-M -C -C")
+
+        Returns:
+            The porcelain blame output
+
+        Raises:
+            FileNotFoundInRepoError: If the file does not exist at the given commit
+        """
+        global _cache_dirty
+
+        # Output differs per detection level, so it is part of every key
+        cache_key = f"blame:{copy_detection}:{commit}:{file_path}"
+        # Commit this file was last blamed at, with its output still cached
+        checkpoint_key = f"blame-checkpoint:{self.repo_id}:{copy_detection}:{file_path}"
+        previous = _cache.get(checkpoint_key)
+        previous_key = f"blame:{copy_detection}:{previous}:{file_path}"
+
+        if (
+            previous is not None
+            and previous_key in _cache
+            and cache_key not in _cache
+            # Blame follows history, so the checkpoint's output only carries
+            # over if the checkpoint is in this commit's history (not e.g.
+            # on another branch, or replaced by a rebase)
+            and self._is_ancestor(previous, commit)
+        ):
+            changed = self._changed_paths(previous, commit)
+            if changed is not None and file_path not in changed:
+                # File is unchanged since the checkpoint, so its blame is too
+                with _cache_lock:
+                    _cache[cache_key] = _cache[previous_key]
+                    _cache_dirty = True
+
+        try:
+            stdout = git(
+                "-C",
+                str(self.path),
+                "blame",
+                "--porcelain",
+                *copy_detection.split(),
+                commit,
+                "--",
+                file_path,
+                cache_key=cache_key,
+                large=True,
+            )
+        except subprocess.CalledProcessError as e:
+            stderr = (
+                e.stderr.decode("utf-8", errors="replace")
+                if isinstance(e.stderr, bytes)
+                else e.stderr
+            )
+            if "no such path" in stderr.lower() or "fatal:" in stderr.lower():
+                raise FileNotFoundInRepoError(file_path, commit, self.path)
+            raise
+
+        if previous != commit:
+            # Advance the checkpoint and drop the superseded blame output
+            with _cache_lock:
+                _cache[checkpoint_key] = commit
+                _cache.pop(previous_key, None)
+                _cache_dirty = True
+        return stdout
+
+    def _is_ancestor(self, old_commit: str, new_commit: str) -> bool:
+        """
+        Check whether a commit is an ancestor of (or equal to) another.
+
+        Computed once per commit pair and shared by all files checked
+        against it.
+
+        Args:
+            old_commit: The earlier full commit hash
+            new_commit: The later full commit hash
+
+        Returns:
+            True if old_commit is in the history of new_commit
+        """
+        key = (old_commit, new_commit)
+        with self._changed_paths_lock:
+            if key not in self._is_ancestor_cache:
+                try:
+                    git(
+                        "-C",
+                        str(self.path),
+                        "merge-base",
+                        "--is-ancestor",
+                        old_commit,
+                        new_commit,
+                        cache_key=f"is-ancestor:{old_commit}:{new_commit}",
+                    )
+                    self._is_ancestor_cache[key] = True
+                except subprocess.CalledProcessError:
+                    # Not an ancestor, or the checkpoint commit is gone
+                    self._is_ancestor_cache[key] = False
+            return self._is_ancestor_cache[key]
+
+    def _changed_paths(self, old_commit: str, new_commit: str) -> set[str] | None:
+        """
+        Get the paths whose content differs between two commits.
+
+        Computed once per commit pair and shared by all files checked
+        against it.
+
+        Args:
+            old_commit: The earlier full commit hash
+            new_commit: The later full commit hash
+
+        Returns:
+            Set of changed file paths, or None if the diff cannot be computed
+        """
+        key = (old_commit, new_commit)
+        with self._changed_paths_lock:
+            if key not in self._changed_paths_cache:
+                try:
+                    stdout = git(
+                        "-C",
+                        str(self.path),
+                        "-c",
+                        "core.quotePath=false",
+                        "diff",
+                        "--name-only",
+                        "--no-renames",
+                        old_commit,
+                        new_commit,
+                        cache_key=f"diff-names:{old_commit}:{new_commit}",
+                    )
+                    self._changed_paths_cache[key] = set(stdout.splitlines())
+                except subprocess.CalledProcessError:
+                    # Checkpoint commit is gone (e.g. after a rebase)
+                    self._changed_paths_cache[key] = None
+            return self._changed_paths_cache[key]
+
+    def blame_many(
+        self,
+        paths: list[str],
+        commit: str = "HEAD",
+        copy_detection: str = DEFAULT_BLAME_COPY_DETECTION,
+    ) -> Iterator[TrackedFile]:
+        """
+        Yield TrackedFile instances for several files, blaming them in parallel.
+
+        The git blame processes run on a bounded thread pool; results are
+        parsed on the calling thread in the order of paths.
+
+        Args:
+            paths: Paths to the files (relative to repository root)
+            commit: The commit hash to get the files at (default: HEAD)
+            copy_detection: Move/copy detection flags for git blame (default: "-M -C -C")
+
+        Yields:
+            TrackedFile instances for each path
+
+        Raises:
+            CommitNotFoundError: If the commit does not exist
+            FileNotFoundInRepoError: If a file does not exist at the given commit
+        """
+        resolved_commit = self.rev_parse(commit)
+        # Cap concurrency to keep the number of open pipes modest
+        executor = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, 8))
+        try:
+            outputs = executor.map(
+                lambda path: self.blame(path, resolved_commit, copy_detection),
+                paths,
+            )
+            for path, stdout in zip(paths, outputs):
+                yield TrackedFile.from_porcelain(path, stdout, self)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def close(self) -> None:
+        """Shut down the persistent cat-file and check-mailmap processes, if any."""
+        procs = list(self._cat_file_procs.values())
+        if self._mailmap_proc is not None:
+            procs.append(self._mailmap_proc)
+        for proc in procs:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait()
+        self._cat_file_procs.clear()
+        self._mailmap_proc = None
+        if self._close_hook is not None:
+            atexit.unregister(self._close_hook)
+            self._close_hook = None
+
+    def _register_close(self) -> None:
+        """Make sure the persistent processes are shut down at exit."""
+        if self._close_hook is None:
+            # The hook only holds a weak reference, so it doesn't keep the
+            # Repo (and everything it has read) alive until exit
+            self._close_hook = functools.partial(_close_repo, weakref.ref(self))
+            atexit.register(self._close_hook)
+
     def get_commit(self, commit_hash: str) -> Commit:
         """
         Get a Commit instance for the given hash.
 
+        Commits are read once per repo and kept in commit_table, so the
+        collection passes and the report share one instance per commit.
+
         Args:
             commit_hash: The commit hash (full or short)
 
         Returns:
-            Commit instance with hash and message lines
+            Commit instance with hash, author, date and message
 
         Raises:
             CommitNotFoundError: If the commit does not exist
         """
-        return Commit.get(commit_hash, self)
+        if not _COMMIT_HASH_RE.fullmatch(commit_hash):
+            commit_hash = self.rev_parse(commit_hash)
+        return self.commit_table[self.commit_id(commit_hash)]
+
+    def commit_id(self, commit_hash: str) -> int:
+        """
+        Get the index of a commit in commit_table, adding it if needed.
+
+        Args:
+            commit_hash: The full commit hash
+
+        Returns:
+            Index of the Commit instance in commit_table
 
-    def get_tracked_file(self, file_path: str, commit: str = "HEAD") -> TrackedFile:
+        Raises:
+            CommitNotFoundError: If the commit does not exist
+        """
+        commit_id = self._commit_ids.get(commit_hash)
+        if commit_id is None:
+            commit_id = len(self.commit_table)
+            self.commit_table.append(Commit.get(commit_hash, self))
+            self._commit_ids[commit_hash] = commit_id
+        return commit_id
+
+    def get_tracked_file(
+        self,
+        file_path: str,
+        commit: str = "HEAD",
+        copy_detection: str = DEFAULT_BLAME_COPY_DETECTION,
+    ) -> TrackedFile:
         """
         Get a tracked file with blame information at a specific commit.
 
         Args:
             file_path: Path to the file (relative to repository root)
             commit: The commit hash to get the file at (default: HEAD)
+            copy_detection: Move/copy detection flags for git blame (default: "-M -C -C")
 
         Returns:
-            TrackedFile instance containing the path and list of (Commit, line_content) tuples
+            TrackedFile instance containing the path and per-line commits and contents
 
         Raises:
             CommitNotFoundError: If the commit does not exist
             FileNotFoundInRepoError: If the file does not exist at the given commit
         """
-        return TrackedFile.get(file_path, self, commit)
+        return TrackedFile.get(file_path, self, commit, copy_detection)
 
-    def files(self, pattern: str, commit: str = "HEAD") -> Iterator[TrackedFile]:
+    def files(
+        self,
+        pattern: str,
+        commit: str = "HEAD",
+        copy_detection: str = DEFAULT_BLAME_COPY_DETECTION,
+    ) -> Iterator[TrackedFile]:
         """
         Yield TrackedFile instances matching a glob pattern.
 
         Args:
             pattern: Glob pattern to match files (e.g., "*.py", "src/**/*.java")
             commit: The commit hash to get files at (default: HEAD)
+            copy_detection: Move/copy detection flags for git blame (default: "-M -C -C")
 
         Yields:
             TrackedFile instances for each matching file
         """
-        return TrackedFile.files(pattern, self, commit)
+        return TrackedFile.files(pattern, self, commit, copy_detection)
+
+    def tracked_paths(self, commit: str = "HEAD") -> list[str]:
+        """
+        Get the paths of all files tracked by git at a commit.
+
+        The listing is parsed once per commit and shared by all callers.
+
+        Args:
+            commit: The commit hash to list files at (default: HEAD)
+
+        Returns:
+            List of repo-relative file paths
+        """
+        commit = self.rev_parse(commit)
+        paths = self._tree_cache.get(commit)
+        if paths is None:
+            stdout = git(
+                "-C",
+                str(self.path),
+                "-c",
+                "core.quotePath=false",
+                "ls-tree",
+                "-r",
+                "--name-only",
+                commit,
+                cache_key=f"ls-tree:{self.repo_id}:{commit}",
+            )
+            paths = self._tree_cache[commit] = stdout.splitlines()
+        return paths
 
     def get_all_commits(self) -> list[tuple[str, list[str]]]:
         """
@@ -906,39 +1767,38 @@ class Repo:
         Returns:
             List of tuples (commit_hash, list of file paths changed in that commit)
         """
-        # Get all commits with their files using git log
-        # Format: commit hash followed by file list, separated by null chars
+        # Get all commits with their files using git log. With -z, each
+        # commit is "<hash>\n<file>\0<file>\0\0", or "<hash>\0" when it
+        # lists no files (e.g. merges); paths are never quoted
         stdout = git(
             "-C",
             str(self.path),
             "log",
+            "-z",
+            "--no-notes",
             "--pretty=format:%H",
             "--name-only",
-            cache_key=f"log-files:{self.repo_id}",
+            cache_key=f"log-files-z:{self.repo_id}",
         )
 
         commits: list[tuple[str, list[str]]] = []
-        current_hash: str | None = None
         current_files: list[str] = []
+        expect_hash = True
 
-        for line in stdout.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            # Check if this is a commit hash (40 hex chars)
-            if len(line) == 40 and all(c in "0123456789abcdef" for c in line):
-                # Save previous commit if exists
-                if current_hash is not None:
-                    commits.append((current_hash, current_files))
-                current_hash = line
-                current_files = []
+        for token in stdout.split("\0"):
+            if expect_hash:
+                if not token:
+                    continue
+                commit_hash, _, first_file = token.partition("\n")
+                current_files = [first_file] if first_file else []
+                commits.append((commit_hash, current_files))
+                # A commit without files is followed directly by the next one
+                expect_hash = not first_file
+            elif token:
+                current_files.append(token)
             else:
-                # This is a file path
-                current_files.append(line)
-
-        # Don't forget the last commit
-        if current_hash is not None:
-            commits.append((current_hash, current_files))
+                # Empty token: end of this commit's file list
+                expect_hash = True
 
         return commits
 
@@ -955,43 +1815,124 @@ class Repo:
         Returns:
             Set of file paths with non-whitespace changes
         """
+        if not _COMMIT_HASH_RE.fullmatch(commit_hash):
+            try:
+                commit_hash = self.rev_parse(commit_hash)
+            except CommitNotFoundError:
+                return set()
+        return self.get_commits_non_whitespace_files([commit_hash])[commit_hash]
+
+    def get_commits_non_whitespace_files(
+        self, commit_hashes: list[str]
+    ) -> dict[str, set[str]]:
+        """
+        Get files that have non-whitespace changes, for many commits at once.
+
+        The result for each commit is cached, and all uncached commits are
+        read with a single git process.
+
+        Args:
+            commit_hashes: Full hashes of the commits to check
+
+        Returns:
+            Dictionary mapping each commit hash to the set of file paths with
+            non-whitespace changes (empty if its diff could not be read)
+        """
+        global _cache_dirty
+
+        files_by_commit: dict[str, set[str]] = {}
+        missing: list[str] = []
+        for commit_hash in commit_hashes:
+            cached = _cache.get(f"non-ws-files:{self.repo_id}:{commit_hash}")
+            if cached is None:
+                missing.append(commit_hash)
+            else:
+                files_by_commit[commit_hash] = (
+                    set(cached.split("\0")) if cached else set()
+                )
+        if not missing:
+            return files_by_commit
+
         try:
-            # Get the diff for this commit
-            diff_output = git(
+            files_by_commit.update(self._read_non_whitespace_files(missing))
+        except subprocess.CalledProcessError:
+            # If we can't get the diffs, assume no files have changes
+            for commit_hash in missing:
+                files_by_commit.setdefault(commit_hash, set())
+            return files_by_commit
+
+        with _cache_lock:
+            for commit_hash in missing:
+                # Commits without any non-whitespace change are left out by git
+                files = files_by_commit.setdefault(commit_hash, set())
+                _cache[f"non-ws-files:{self.repo_id}:{commit_hash}"] = "\0".join(
+                    sorted(files)
+                )
+            _cache_dirty = True
+        return files_by_commit
+
+    def _read_non_whitespace_files(
+        self, commit_hashes: list[str]
+    ) -> dict[str, set[str]]:
+        """
+        Ask git which files have non-whitespace changes in each commit.
+
+        "git log -G" keeps only the files with an added or removed line
+        containing a non-whitespace character, and --name-only lists just
+        their paths, so no diff text has to be read or parsed here.
+
+        Args:
+            commit_hashes: Full hashes of the commits to check
+
+        Returns:
+            Dictionary mapping commit hashes to sets of file paths (commits
+            without such files may be missing)
+
+        Raises:
+            subprocess.CalledProcessError: If git fails
+        """
+        result = subprocess.run(
+            [
+                git.path,
                 "-C",
                 str(self.path),
-                "show",
-                commit_hash,
-                "--format=",  # No commit info, just diff
-                "-p",  # Show patch
-                cache_key=f"show-diff:{self.repo_id}:{commit_hash}",
-            )
-        except Exception:
-            # If we can't get the diff, assume all files have changes
-            return set()
-
-        files_with_changes: set[str] = set()
-        current_file: str | None = None
-
-        for line in diff_output.splitlines():
-            # Detect file header: diff --git a/path b/path
-            if line.startswith("diff --git "):
-                parts = line.split(" ")
-                if len(parts) >= 4:
-                    b_path = parts[3]
-                    if b_path.startswith("b/"):
-                        current_file = b_path[2:]
-                    else:
-                        current_file = b_path
-            # Check added/removed lines for non-whitespace content
-            elif current_file and (line.startswith("+") or line.startswith("-")):
-                if line.startswith("+++") or line.startswith("---"):
-                    continue
-                content = line[1:]
-                if content.strip():
-                    files_with_changes.add(current_file)
+                "log",
+                "--no-walk=unsorted",
+                "--stdin",
+                # Merge commits never counted: "git show" gives them a combined
+                # diff, whose "diff --cc" headers name no file here
+                "--no-merges",
+                "--format=%x00%H",  # NUL marks the start of each commit
+                "--name-only",
+                "-z",
+                "-G[^[:space:]]",
+            ],
+            input="\n".join(commit_hashes).encode("utf-8"),
+            capture_output=True,
+            check=True,
+            env=git.env,
+        )
 
-        return files_with_changes
+        # Output is "\0<hash>\0\n<path>\0<path>\0..." per commit. A token is
+        # a commit header if it follows an empty token and is one of the
+        # requested hashes; everything else non-empty is a path
+        requested = set(commit_hashes)
+        files_by_commit: dict[str, set[str]] = {}
+        current_files: set[str] | None = None
+        after_header = False
+        previous_empty = True
+        for token in result.stdout.decode("utf-8", errors="replace").split("\0"):
+            if previous_empty and token in requested:
+                current_files = files_by_commit[token] = set()
+                after_header = True
+            else:
+                if after_header and token.startswith("\n"):
+                    token = token[1:]
+                after_header = False
+                if token and current_files is not None:
+                    current_files.add(token)
+            previous_empty = not token
+        return files_by_commit
 
     def get_students_json_dict(self) -> dict[str, Any] | None:
         """
@@ -1004,78 +1945,84 @@ class Repo:
         Returns:
             The students config as a dict, or None if not found
         """
+        global _cache_dirty
+
         magic_id = "619a9605-0e2b-45ee-ac51-a539c59d70bb"
+        cache_key = f"students-config-path:{self.path}"
 
-        # Check if we have a cached path that still works
+        # Check the path found earlier, in this run or a previous one
+        if self._students_config_path is None:
+            self._students_config_path = _cache.get(cache_key)
         if self._students_config_path:
             config_file = self.path / self._students_config_path
-            try:
-                if config_file.exists():
-                    with open(config_file, "r", encoding="utf-8") as f:
-                        cached_data: dict[str, Any] = json.load(f)
-                    if cached_data.get("id") == magic_id:
-                        return cached_data
-            except json.JSONDecodeError as e:
-                raise StudentsConfigError(
-                    f"Students config file has invalid JSON: {config_file}\n{e}"
-                )
-            except OSError:
-                pass
+            cached_data = self._read_students_json(config_file, magic_id)
+            if cached_data is not None:
+                return cached_data
             # Cached path no longer valid, clear it
             self._students_config_path = None
+            with _cache_lock:
+                if _cache.pop(cache_key, None) is not None:
+                    _cache_dirty = True
 
-        # Search through all .json files in repo directory (including hidden ones)
-        for config_file in self.path.glob("*.json"):
-            try:
-                with open(config_file, "r", encoding="utf-8") as f:
-                    data: dict[str, Any] = json.load(f)
+        # Search through all .json files in repo directory (including hidden
+        # ones such as .students.json)
+        try:
+            with os.scandir(self.path) as entries:
+                candidates = [
+                    entry.name
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except OSError:
+            return None
+        for name in candidates:
+            data = self._read_students_json(self.path / name, magic_id)
+            if data is not None:
+                # Found it, cache the path
+                self._students_config_path = name
+                with _cache_lock:
+                    _cache[cache_key] = self._students_config_path
+                    _cache_dirty = True
+                return data
 
-                if isinstance(data, dict) and data.get("id") == magic_id:
-                    # Found it, cache the path
-                    self._students_config_path = str(config_file.relative_to(self.path))
-                    return data
+        return None
 
-            except json.JSONDecodeError as e:
-                try:
-                    raw = config_file.read_text(encoding="utf-8", errors="replace")
-                    if magic_id in raw:
-                        raise StudentsConfigError(
-                            f"Students config file has invalid JSON: {config_file}\n{e}"
-                        )
-                except StudentsConfigError:
-                    raise
-                except OSError:
-                    pass
-                continue
-            except (OSError, TypeError):
-                continue
+    @staticmethod
+    def _read_students_json(config_file: Path, magic_id: str) -> dict[str, Any] | None:
+        """
+        Read a candidate students config file.
 
-        # Also check hidden .json files
-        for config_file in self.path.glob(".*.json"):
-            try:
-                with open(config_file, "r", encoding="utf-8") as f:
-                    data2: dict[str, Any] = json.load(f)
+        Files that don't contain the magic ID anywhere are rejected before
+        parsing, so unrelated JSON files in the repo cost only a read.
+
+        Args:
+            config_file: Path to the candidate file
+            magic_id: The ID that identifies the students config
 
-                if isinstance(data2, dict) and data2.get("id") == magic_id:
-                    # Found it, cache the path
-                    self._students_config_path = str(config_file.relative_to(self.path))
-                    return data2
+        Returns:
+            The parsed config, or None if the file is not the students config
 
-            except json.JSONDecodeError as e:
-                try:
-                    raw = config_file.read_text(encoding="utf-8", errors="replace")
-                    if magic_id in raw:
-                        raise StudentsConfigError(
-                            f"Students config file has invalid JSON: {config_file}\n{e}"
-                        )
-                except StudentsConfigError:
-                    raise
-                except OSError:
-                    pass
-                continue
-            except (OSError, TypeError):
-                continue
+        Raises:
+            StudentsConfigError: If the file mentions the magic ID but is not
+                valid JSON
+        """
+        try:
+            if config_file.stat().st_size > _STUDENTS_JSON_MAX_SIZE:
+                return None
+            raw = config_file.read_bytes()
+        except OSError:
+            return None
+        if magic_id.encode("ascii") not in raw:
+            return None
 
+        try:
+            data: Any = json.loads(raw)
+        except ValueError as e:
+            raise StudentsConfigError(
+                f"Students config file has invalid JSON: {config_file}\n{e}"
+            ) from e
+        if isinstance(data, dict) and data.get("id") == magic_id:
+            return cast(dict[str, Any], data)
         return None
 
     def get_students_config(self) -> StudentsConfig:
@@ -1095,22 +2042,17 @@ class Repo:
             )
         return StudentsConfig.from_dict(data)
 
-    def _get_pr_commits(self, gh_path: str, pr_number: int) -> list[PullRequestCommit]:
+    def _get_pr_commit_hashes(self, gh_path: str, pr_number: int) -> list[str]:
         """
-        Get commits for a single PR using local git when possible.
-
-        Fetches commit hashes from GitHub, then uses local git to get
-        commit details including co-authors from the message body.
+        Get the hashes of the commits in a single PR from GitHub.
 
         Args:
             gh_path: Path to gh executable
             pr_number: The PR number to fetch commits for
 
         Returns:
-            List of PullRequestCommit instances
+            List of commit hashes (empty if they can't be fetched)
         """
-        commits: list[PullRequestCommit] = []
-
         try:
             # Get commit hashes from GitHub (lightweight query)
             result = subprocess.run(
@@ -1126,28 +2068,43 @@ class Repo:
                 capture_output=True,
                 check=True,
             )
-            data = json.loads(result.stdout.decode("utf-8"))
+            data = json.loads(result.stdout)
         except (subprocess.CalledProcessError, json.JSONDecodeError):
             # If we can't fetch commits, return empty list
-            return commits
+            return []
 
-        for commit_data in data.get("commits", []):
-            commit_hash = commit_data.get("oid", "")
-            if not commit_hash:
-                continue
+        return [
+            commit_data["oid"]
+            for commit_data in data.get("commits", [])
+            if commit_data.get("oid")
+        ]
+
+    def _get_pr_commits(self, commit_hashes: list[str]) -> list[PullRequestCommit]:
+        """
+        Get commits of a PR using local git.
+
+        Uses local git to get commit details including co-authors from
+        the message body.
+
+        Args:
+            commit_hashes: Hashes of the PR's commits, from GitHub
+
+        Returns:
+            List of PullRequestCommit instances
+        """
+        commits: list[PullRequestCommit] = []
+
+        for commit_hash in commit_hashes:
 
             # Try to get commit details from local git first
             try:
                 local_commit = self.get_commit(commit_hash)
                 # Use local git data
-                co_author_objects = local_commit.get_co_authors()
+                co_author_objects = local_commit.co_authors
                 co_author_names = [
                     ca.github_username or ca.name for ca in co_author_objects
                 ]
-                # First message line is the subject
-                subject = (
-                    local_commit.message_lines[0] if local_commit.message_lines else ""
-                )
+                subject = local_commit.subject
                 commits.append(
                     PullRequestCommit(
                         hash=commit_hash,
@@ -1159,6 +2116,7 @@ class Repo:
                     )
                 )
             except (
+                CommitNotFoundError,
                 subprocess.CalledProcessError,
                 IndexError,
                 ValueError,
@@ -1188,8 +2146,6 @@ class Repo:
         if self._pull_requests is not None:
             return self._pull_requests
 
-        global _pr_cache, _cache_dirty
-
         # Check if gh is available
         gh_path = shutil.which("gh")
         if not gh_path:
@@ -1198,7 +2154,7 @@ class Repo:
         repo_key = self.repo_id
 
         try:
-            # First, fetch just PR numbers and states to see what's new/changed
+            # Fetch the summary and details of all PRs in one call
             result = subprocess.run(
                 [
                     gh_path,
@@ -1209,13 +2165,14 @@ class Repo:
                     "--limit",
                     "500",
                     "--json",
-                    "number,state",
+                    "number,author,createdAt,state,mergedAt,mergedBy,reviews,"
+                    "files,headRefOid",
                 ],
                 cwd=self.path,
                 capture_output=True,
                 check=True,
             )
-            pr_summary = json.loads(result.stdout.decode("utf-8"))
+            data = json.loads(result.stdout)
         except subprocess.CalledProcessError as e:
             stderr = (
                 e.stderr.decode("utf-8", errors="replace")
@@ -1228,19 +2185,19 @@ class Repo:
 
         pull_requests: list[PullRequest] = []
 
-        # Determine which PRs need full fetch
-        prs_to_fetch: list[int] = []
-        for pr_info in pr_summary:
-            pr_number = pr_info.get("number", 0)
-            state = pr_info.get("state", "OPEN").upper()
+        # Determine which PRs need their commits and diff fetched
+        prs_to_fetch: list[dict[str, Any]] = []
+        for pr_data in data:
+            pr_number = pr_data.get("number", 0)
+            state = pr_data.get("state", "OPEN").upper()
 
             # If it's closed/merged and we have it cached, use cache
             if state != "OPEN" and (repo_key, pr_number) in _pr_cache:
                 pull_requests.append(_pr_cache[(repo_key, pr_number)])
             else:
-                prs_to_fetch.append(pr_number)
+                prs_to_fetch.append(pr_data)
 
-        # Fetch full details for PRs that aren't cached
+        # Fetch the remaining details for PRs that aren't cached
         if prs_to_fetch:
             fetched_prs = self._fetch_pr_details(gh_path, prs_to_fetch)
             for pr in fetched_prs:
@@ -1248,69 +2205,58 @@ class Repo:
                 # Cache closed PRs
                 if not pr.is_open:
                     _pr_cache[(repo_key, pr.number)] = pr
-                    _cache_dirty = True
 
         self._pull_requests = pull_requests
         return pull_requests
 
     def _fetch_pr_details(
-        self, gh_path: str, pr_numbers: list[int]
+        self, gh_path: str, prs_data: list[dict[str, Any]]
     ) -> list[PullRequest]:
         """
-        Fetch full details for specific PRs.
+        Build PullRequest instances from "gh pr list" entries.
+
+        The commits and the diff of each PR are not part of the list output
+        and are fetched individually.
 
         Args:
             gh_path: Path to gh executable
-            pr_numbers: List of PR numbers to fetch
+            prs_data: PR entries from "gh pr list --json"
 
         Returns:
             List of PullRequest instances
         """
-        if not pr_numbers:
-            return []
+        pull_requests: list[PullRequest] = []
 
-        # Build query for specific PRs
-        # We need to fetch them one by one or use search
-        # For simplicity, fetch all and filter
+        # The gh calls for each PR are independent and network-bound, so run
+        # them concurrently; local git lookups stay on this thread
+        pr_numbers = [pr_data.get("number", 0) for pr_data in prs_data]
+        executor = ThreadPoolExecutor(max_workers=8)
         try:
-            result = subprocess.run(
-                [
+            hashes_futures = [
+                executor.submit(self._get_pr_commit_hashes, gh_path, pr_number)
+                for pr_number in pr_numbers
+            ]
+            non_ws_futures = [
+                executor.submit(
+                    self._get_pr_diff_non_whitespace_files,
                     gh_path,
-                    "pr",
-                    "list",
-                    "--state",
-                    "all",
-                    "--limit",
-                    "500",
-                    "--json",
-                    "number,author,createdAt,state,mergedAt,mergedBy,reviews,files",
-                ],
-                cwd=self.path,
-                capture_output=True,
-                check=True,
-            )
-            data = json.loads(result.stdout.decode("utf-8"))
-        except subprocess.CalledProcessError as e:
-            stderr = (
-                e.stderr.decode("utf-8", errors="replace")
-                if isinstance(e.stderr, bytes)
-                else str(e.stderr)
-            )
-            raise GitHubApiError(f"Failed to fetch pull requests: {stderr}") from e
-        except json.JSONDecodeError as e:
-            raise GitHubApiError(f"Invalid JSON from gh: {e}") from e
-
-        # Filter to only requested PRs
-        pr_number_set = set(pr_numbers)
-        pull_requests: list[PullRequest] = []
-
-        for pr_data in data:
-            pr_number = pr_data.get("number", 0)
-            if pr_number not in pr_number_set:
-                continue
+                    pr_data.get("number", 0),
+                    pr_data.get("headRefOid") or "",
+                )
+                for pr_data in prs_data
+            ]
+            # Commit hashes and files with non-whitespace changes, per PR
+            fetched = [
+                (hashes_future.result(), non_ws_future.result())
+                for hashes_future, non_ws_future in zip(hashes_futures, non_ws_futures)
+            ]
+        finally:
+            executor.shutdown(cancel_futures=True)
 
-            # Fetch commit hashes for this PR individually
-            commits = self._get_pr_commits(gh_path, pr_number)
+        for pr_data, pr_number, (commit_hashes, non_ws_files) in zip(
+            prs_data, pr_numbers, fetched
+        ):
+            commits = self._get_pr_commits(commit_hashes)
 
             # Parse reviews
             reviews: list[PullRequestReview] = []
@@ -1338,9 +2284,6 @@ class Repo:
                 merged_by_data.get("login", "") if merged_by_data else None
             )
 
-            # Get files with non-whitespace changes from diff
-            non_ws_files = self._get_pr_diff_non_whitespace_files(gh_path, pr_number)
-
             # Parse files with additions/deletions
             files_data = pr_data.get("files", [])
             files = [
@@ -1379,21 +2322,32 @@ class Repo:
         return pull_requests
 
     def _get_pr_diff_non_whitespace_files(
-        self, gh_path: str, pr_number: int
+        self, gh_path: str, pr_number: int, head_sha: str = ""
     ) -> set[str]:
         """
         Get the set of file paths that have non-whitespace changes in a PR.
 
         Parses the unified diff output to find files where added or removed
-        lines contain non-whitespace content.
+        lines contain non-whitespace content. When the PR's head commit is
+        known, the result is cached for that head, so an unchanged PR (open
+        or not) is not diffed again.
 
         Args:
             gh_path: Path to gh executable
             pr_number: PR number to get diff for
+            head_sha: Hash of the PR's head commit (empty to skip the cache)
 
         Returns:
             Set of file paths with non-whitespace changes
         """
+        global _cache_dirty
+
+        cache_key = f"pr-diff-non-ws:{self.repo_id}:{pr_number}:{head_sha}"
+        if head_sha:
+            cached = _cache.get(cache_key)
+            if cached is not None:
+                return set(cached.split("\0")) if cached else set()
+
         try:
             result = subprocess.run(
                 [gh_path, "pr", "diff", str(pr_number)],
@@ -1408,32 +2362,11 @@ class Repo:
         except Exception:
             return set()
 
-        files_with_changes: set[str] = set()
-        current_file: str | None = None
-
-        for line in diff_output.splitlines():
-            # Detect file header: diff --git a/path b/path
-            if line.startswith("diff --git "):
-                # Extract path from "diff --git a/path b/path"
-                parts = line.split(" ")
-                if len(parts) >= 4:
-                    # b/path is the destination file
-                    b_path = parts[3]
-                    if b_path.startswith("b/"):
-                        current_file = b_path[2:]  # Remove "b/" prefix
-                    else:
-                        current_file = b_path
-            # Check added/removed lines for non-whitespace content
-            elif current_file and (line.startswith("+") or line.startswith("-")):
-                # Skip diff headers like +++ and ---
-                if line.startswith("+++") or line.startswith("---"):
-                    continue
-                # Get the actual content (without the +/- prefix)
-                content = line[1:]
-                # Check if it has non-whitespace content
-                if content.strip():
-                    files_with_changes.add(current_file)
-
+        files_with_changes = _non_whitespace_diff_files(diff_output)
+        if head_sha:
+            with _cache_lock:
+                _cache[cache_key] = "\0".join(sorted(files_with_changes))
+                _cache_dirty = True
         return files_with_changes
 
 
@@ -1496,54 +2429,139 @@ def get_templates_dir() -> Path:
     return get_data_dir() / "templates"
 
 
+class PRCacheStore:
+    """
+    Cache of closed pull requests, stored as one JSON file per PR.
+
+    Entries are keyed by (repo_id, pr_number) and live in
+    prs/<repo_id>/<pr_number>.json under the cache directory. Files are
+    read on first access and only entries set since the last flush are
+    written back, so saving costs O(changed PRs) rather than O(all PRs).
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, int], PullRequest] = {}
+        self._dirty: set[tuple[str, int]] = set()
+
+    @staticmethod
+    def _path(key: tuple[str, int]) -> Path:
+        repo_id, pr_number = key
+        return get_cache_dir() / "prs" / quote(repo_id, safe="") / f"{pr_number}.json"
+
+    def _load(self, key: tuple[str, int]) -> PullRequest | None:
+        pr = self._entries.get(key)
+        if pr is not None:
+            return pr
+        try:
+            with open(self._path(key), "rb") as f:
+                pr = PullRequest.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or unreadable entry; treat as a cache miss
+            return None
+        self._entries[key] = pr
+        return pr
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        return self._load(key) is not None
+
+    def __getitem__(self, key: tuple[str, int]) -> PullRequest:
+        pr = self._load(key)
+        if pr is None:
+            raise KeyError(key)
+        return pr
+
+    def __setitem__(self, key: tuple[str, int], pr: PullRequest) -> None:
+        self._entries[key] = pr
+        self._dirty.add(key)
+
+    def flush(self) -> None:
+        """Write entries changed since the last flush to disk."""
+        for key in list(self._dirty):
+            path = self._path(key)
+            tmp_path = path.with_name(path.name + ".tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(asdict(self._entries[key]), f)
+                os.replace(tmp_path, path)
+            except OSError:
+                # Failed to write this entry, retry on the next flush
+                continue
+            self._dirty.discard(key)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries without touching disk."""
+        self._entries.clear()
+        self._dirty.clear()
+
+
+# Global PR cache: (repo_id, pr_number) -> PullRequest for closed PRs
+_pr_cache = PRCacheStore()
+
+
 def get_cache_file_path() -> Path:
     """Get the path to the cache file."""
     return get_cache_dir() / "cache.pickle"
 
 
 def load_cache() -> None:
-    """Load the entire cache from disk."""
-    global _cache, _pr_cache
+    """Load the command output cache from disk (PRs are loaded on demand)."""
+    global _cache
     cache_path = get_cache_file_path()
     if cache_path.exists():
         try:
-            with open(cache_path, "rb") as f:
+            with open(cache_path, "rb") as raw_f:
+                # Caches written before compression was added are plain pickle
+                is_gzip = raw_f.read(2) == b"\x1f\x8b"
+                raw_f.seek(0)
+                f = gzip.GzipFile(fileobj=raw_f, mode="rb") if is_gzip else raw_f
                 loaded: Any = pickle.load(f)
-                # Handle old cache format (just dict) vs new format (tuple)
+                # Older caches stored a (command cache, PR cache) tuple
                 if (
                     isinstance(loaded, tuple)
                     and len(cast(tuple[Any, ...], loaded)) == 2
                 ):
-                    loaded_tuple = cast(tuple[Any, Any], loaded)
-                    _cache = cast(dict[str, str], loaded_tuple[0])
-                    _pr_cache = cast(
-                        dict[tuple[str, int], "PullRequest"], loaded_tuple[1]
-                    )
-                elif isinstance(loaded, dict):
+                    loaded = cast(tuple[Any, Any], loaded)[0]
+                if isinstance(loaded, dict):
                     _cache = cast(dict[str, str], loaded)
-                    _pr_cache = {}
                 else:
                     _cache = {}
-                    _pr_cache = {}
-        except (pickle.PickleError, EOFError, OSError):
+        except (pickle.PickleError, EOFError, OSError, zlib.error):
             # Cache corrupted, start fresh
             _cache = {}
-            _pr_cache = {}
 
 
 def save_cache() -> None:
-    """Save the entire cache to disk."""
+    """Save the command output cache and any changed PR entries to disk."""
     global _cache_dirty
+    _pr_cache.flush()
     if not _cache_dirty:
         return
     cache_path = get_cache_file_path()
+    tmp_path: str | None = None
     try:
-        with open(cache_path, "wb") as f:
-            pickle.dump((_cache, _pr_cache), f)
+        # Write to a temporary file next to the cache and swap it in, so an
+        # interrupted write or a concurrent run never sees a partial file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=cache_path.name + ".", suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as raw_f:
+            # Level 1 compression: cached git output shrinks several times
+            # over for little CPU
+            with gzip.GzipFile(fileobj=raw_f, mode="wb", compresslevel=1) as f:
+                pickle.dump(_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
         _cache_dirty = False
     except OSError:
         # Failed to write cache, ignore
         pass
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 
 def _signal_handler(signum: int, frame: Any) -> None:
@@ -1564,7 +2582,7 @@ def setup_cache_handlers() -> None:
 
 def clear_cache() -> None:
     """Clear all cached data."""
-    global _cache, _pr_cache, _cache_dirty
+    global _cache, _cache_dirty
     cache_dir = get_cache_dir()
     if cache_dir.exists():
         shutil.rmtree(cache_dir)
@@ -1572,13 +2590,15 @@ def clear_cache() -> None:
     else:
         print(f"Cache directory does not exist: {cache_dir}")
     _cache = {}
-    _pr_cache = {}
+    _pr_cache.clear()
     _cache_dirty = False
 
 
 # Type aliases for analysis results
-LinesData = dict[Author, dict[str, list[str]]]
-CommitsData = dict[Author, set[str]]
+# Non-whitespace line counts per student and file path
+LinesData = dict[Author, dict[str, int]]
+# Commits per student, as a bitset over Repo.commit_table ids
+CommitsData = dict[Author, int]
 GitHubStatsData = dict[Author, GitHubStats]
 
 
@@ -1588,9 +2608,13 @@ class AnalysisResult:
 
     alone_lines: LinesData
     collab_lines: LinesData
+    # Per-student sums of alone_lines / collab_lines
+    alone_line_totals: dict[Author, int]
+    collab_line_totals: dict[Author, int]
     alone_commits: CommitsData
     collab_commits: CommitsData
     file_commits: dict[str, set[str]]
+    commits_by_hash: dict[str, Commit]
     github_stats: GitHubStatsData | None = None
 
 
@@ -1618,50 +2642,43 @@ def _collect_github_stats(
     Returns:
         Dictionary mapping Author to their GitHubStats
     """
-    from fnmatch import fnmatch
-
-    # Build mapping from GitHub username to Author
-    username_to_author: dict[str, Author] = {}
-    for student in students_config.students:
-        username_to_author[student.github_username.lower()] = student
+    # Mapping from GitHub username to Author
+    username_to_author = students_config.username_to_author
 
     # Initialize stats for each student
     stats: GitHubStatsData = {s: GitHubStats() for s in students_config.students}
 
-    # Helper to check if a file matches include patterns
-    def matches_include(file_path: str) -> bool:
-        for pattern in include_patterns:
-            if fnmatch(file_path, pattern):
-                return True
-            # "**/" prefix should also match root-level files (Path.glob behaviour)
-            if pattern.startswith("**/") and fnmatch(file_path, pattern[3:]):
-                return True
-        return False
-
-    # Helper to check if a file should be excluded
-    def should_exclude(file_path: str) -> bool:
-        for pattern in exclude_patterns:
-            if fnmatch(file_path, pattern):
-                return True
-            # "**/" prefix should also match root-level files (Path.glob behaviour)
-            if pattern.startswith("**/") and fnmatch(file_path, pattern[3:]):
-                return True
-        return False
+    # "**/" also matches root-level files (Path.glob behaviour)
+    include_re, exclude_re = _compile_patterns(
+        tuple(include_patterns), tuple(exclude_patterns), root_level=True
+    )
+
+    # A bare "*" includes every path (the default when no include patterns
+    # are configured), so the include regex can be skipped
+    include_all = "*" in include_patterns
+
+    # Helper to check if a file matches include patterns and isn't excluded
+    # (the same paths recur across PRs, so answers are remembered)
+    @functools.lru_cache(maxsize=None)
+    def is_matching_file(file_path: str) -> bool:
+        file_path = os.path.normcase(file_path)
+        if exclude_re is not None and exclude_re.match(file_path) is not None:
+            return False
+        return include_all or (
+            include_re is not None and include_re.match(file_path) is not None
+        )
 
     # Helper to check if PR has matching files with non-whitespace changes
+    # (cheapest check first)
     def pr_has_matching_files(pr: PullRequest) -> bool:
-        for pr_file in pr.files:
-            if matches_include(pr_file.path) and not should_exclude(pr_file.path):
-                if pr_file.has_non_whitespace_changes:
-                    return True
-        return False
+        return any(
+            pr_file.has_non_whitespace_changes and is_matching_file(pr_file.path)
+            for pr_file in pr.files
+        )
 
     # Helper to check if PR is collaborative (has any commits with co-authors)
     def pr_is_collab(pr: PullRequest) -> bool:
-        for commit in pr.commits:
-            if commit.co_authors:
-                return True
-        return False
+        return any(commit.co_authors for commit in pr.commits)
 
     # Fetch PRs
     pull_requests = repo.get_pull_requests()
@@ -1714,118 +2731,103 @@ def _collect_github_stats(
     return stats
 
 
-def _collect_line_stats(
+def _collect_all_stats(
     repo: Repo,
     students_config: StudentsConfig,
-    ignored_authors: set[Author],
+    ignored_authors: frozenset[Author],
     include_patterns: list[str],
     exclude_patterns: list[str],
-) -> tuple[LinesData, LinesData, dict[str, set[str]], dict[str, list[Author]]]:
-    """Collect line statistics from blame data."""
-    from fnmatch import fnmatch
+) -> AnalysisResult:
+    """Collect line and commit statistics from blame data in one pass.
 
+    Commits are the ones found by git blame, to ensure consistency with line
+    statistics. This means commits that introduced code via copy/move
+    (detected by git blame -C -C) are counted even if they didn't directly
+    modify matching files. Each commit is classified the first time one of
+    its lines is counted.
+    """
     alone_lines: LinesData = {s: {} for s in students_config.students}
     collab_lines: LinesData = {s: {} for s in students_config.students}
+    alone_commits: CommitsData = {s: 0 for s in students_config.students}
+    collab_commits: CommitsData = {s: 0 for s in students_config.students}
     file_commits: dict[str, set[str]] = {}
-    coauthors_cache: dict[str, list[Author]] = {}
+    commits_by_hash: dict[str, Commit] = {}
+
+    # Included files come from the globs; exclusion follows fnmatch and is
+    # decided once per path, even if several include patterns yield it
+    exclude_re = _compile_globset(exclude_patterns)
+    path_excluded: dict[str, bool] = {}
 
-    def should_exclude(file_path: str) -> bool:
-        for pattern in exclude_patterns:
-            if fnmatch(file_path, pattern):
-                return True
-        return False
+    # Per blame commit id: the commit hash and the per-student line count
+    # dicts each of its lines is tallied into, or None if the commit's author
+    # is ignored
+    commit_info: dict[int, tuple[str, list[dict[str, int]]] | None] = {}
+
+    def get_commit_info(commit_id: int) -> tuple[str, list[dict[str, int]]] | None:
+        commit = repo.commit_table[commit_id]
+        if commit.author in ignored_authors:
+            return None
+        valid_co_authors = [ca for ca in commit.co_authors if ca not in ignored_authors]
+        commits_by_hash[commit.hash] = commit
+
+        # Both the author and the co-authors get credit for collab work
+        line_counts: list[dict[str, int]] = []
+        if valid_co_authors:
+            for student in [commit.author, *valid_co_authors]:
+                if student in collab_commits:
+                    collab_commits[student] |= 1 << commit_id
+                    line_counts.append(collab_lines[student])
+        elif commit.author in alone_commits:
+            alone_commits[commit.author] |= 1 << commit_id
+            line_counts.append(alone_lines[commit.author])
+
+        return commit.hash, line_counts
 
     for pattern in include_patterns:
-        for tracked_file in repo.files(pattern):
-            if should_exclude(tracked_file.path):
+        for tracked_file in repo.files(
+            pattern, copy_detection=students_config.blame_copy_detection
+        ):
+            # One shared string per path for all the per-student dicts below
+            # (and the same object PR files and the report use)
+            path = sys.intern(tracked_file.path)
+            excluded = path_excluded.get(path)
+            if excluded is None:
+                excluded = path_excluded[path] = exclude_re is not None and bool(
+                    exclude_re.match(os.path.normcase(path))
+                )
+            if excluded:
                 continue
 
-            for commit, content in tracked_file.lines:
-                if not content.strip():
-                    continue
-                if commit.author in ignored_authors:
+            hashes: set[str] = set()
+            for commit_id, non_whitespace in zip(
+                tracked_file.commit_ids, tracked_file.non_whitespace
+            ):
+                if not non_whitespace:
                     continue
-
-                if tracked_file.path not in file_commits:
-                    file_commits[tracked_file.path] = set()
-                file_commits[tracked_file.path].add(commit.hash)
-
-                if commit.hash not in coauthors_cache:
-                    coauthors_cache[commit.hash] = commit.get_co_authors()
-                co_authors = coauthors_cache[commit.hash]
-                valid_co_authors = [
-                    ca for ca in co_authors if ca not in ignored_authors
-                ]
-                is_collab = len(valid_co_authors) > 0
-
-                if is_collab:
-                    if commit.author in collab_lines:
-                        if tracked_file.path not in collab_lines[commit.author]:
-                            collab_lines[commit.author][tracked_file.path] = []
-                        collab_lines[commit.author][tracked_file.path].append(content)
-
-                    for co_author in valid_co_authors:
-                        if co_author in collab_lines:
-                            if tracked_file.path not in collab_lines[co_author]:
-                                collab_lines[co_author][tracked_file.path] = []
-                            collab_lines[co_author][tracked_file.path].append(content)
+                if commit_id in commit_info:
+                    info = commit_info[commit_id]
                 else:
-                    if commit.author in alone_lines:
-                        if tracked_file.path not in alone_lines[commit.author]:
-                            alone_lines[commit.author][tracked_file.path] = []
-                        alone_lines[commit.author][tracked_file.path].append(content)
-
-    return alone_lines, collab_lines, file_commits, coauthors_cache
-
-
-def _collect_commit_stats(
-    repo: Repo,
-    students_config: StudentsConfig,
-    ignored_authors: set[Author],
-    file_commits: dict[str, set[str]],
-    coauthors_cache: dict[str, list[Author]],
-) -> tuple[CommitsData, CommitsData]:
-    """Collect commit statistics.
-
-    Uses the commits found by git blame (in file_commits) to ensure consistency
-    with line statistics. This means commits that introduced code via copy/move
-    (detected by git blame -C -C) are counted even if they didn't directly
-    modify matching files.
-    """
-    alone_commits: CommitsData = {s: set() for s in students_config.students}
-    collab_commits: CommitsData = {s: set() for s in students_config.students}
-
-    # Collect unique commits from all files
-    all_commits: set[str] = set()
-    for commits in file_commits.values():
-        all_commits.update(commits)
-
-    for commit_hash in all_commits:
-        try:
-            commit = repo.get_commit(commit_hash)
-        except CommitNotFoundError:
-            continue
-
-        if commit.author in ignored_authors:
-            continue
-
-        if commit_hash not in coauthors_cache:
-            coauthors_cache[commit_hash] = commit.get_co_authors()
-        co_authors = coauthors_cache[commit_hash]
-        valid_co_authors = [ca for ca in co_authors if ca not in ignored_authors]
-        is_collab = len(valid_co_authors) > 0
-
-        if is_collab:
-            if commit.author in collab_commits:
-                collab_commits[commit.author].add(commit_hash)
-            for co_author in valid_co_authors:
-                if co_author in collab_commits:
-                    collab_commits[co_author].add(commit_hash)
-        else:
-            if commit.author in alone_commits:
-                alone_commits[commit.author].add(commit_hash)
-
-    return alone_commits, collab_commits
+                    info = commit_info[commit_id] = get_commit_info(commit_id)
+                if info is None:
+                    continue
+                commit_hash, line_counts = info
+                hashes.add(commit_hash)
+                for counts in line_counts:
+                    counts[path] = counts.get(path, 0) + 1
+
+            if hashes:
+                file_commits.setdefault(path, set()).update(hashes)
+
+    return AnalysisResult(
+        alone_lines=alone_lines,
+        collab_lines=collab_lines,
+        alone_line_totals={s: sum(c.values()) for s, c in alone_lines.items()},
+        collab_line_totals={s: sum(c.values()) for s, c in collab_lines.items()},
+        alone_commits=alone_commits,
+        collab_commits=collab_commits,
+        file_commits=file_commits,
+        commits_by_hash=commits_by_hash,
+    )
 
 
 def _print_summary(
@@ -1835,15 +2837,22 @@ def _print_summary(
     exclude_patterns: list[str],
 ) -> None:
     """Print the student summary table."""
-    print("Include:", ", ".join(include_patterns) if include_patterns else "(all)")
-    print("Exclude:", ", ".join(exclude_patterns) if exclude_patterns else "(none)")
-    print()
+    lines: list[str] = []
+    lines.append(
+        "Include: " + (", ".join(include_patterns) if include_patterns else "(all)")
+    )
+    lines.append(
+        "Exclude: " + (", ".join(exclude_patterns) if exclude_patterns else "(none)")
+    )
+    lines.append("")
 
     max_name_len = max(len(s.name) for s in students_config.students)
     has_gh = result.github_stats is not None
 
-    print("Student summary:")
-    print("  C=Commits, L=Lines, Alone=without co-authors, Collab=with co-authors")
+    lines.append("Student summary:")
+    lines.append(
+        "  C=Commits, L=Lines, Alone=without co-authors, Collab=with co-authors"
+    )
 
     # Helper to format PR count: "merged(unmerged)" or just "merged" if no unmerged
     def fmt_pr(merged: int, unmerged: int) -> str:
@@ -1884,42 +2893,45 @@ def _print_summary(
         )
         sep_len = 3 + 1 + max_name_len + 2 + 8 + 2 + 9 + 2 + 8 + 2 + 9
 
-    print(header)
-    print("-" * sep_len)
+    lines.append(header)
+    lines.append("-" * sep_len)
 
     for student in students_config.students:
-        total_alone = sum(len(lines) for lines in result.alone_lines[student].values())
-        total_collab = sum(
-            len(lines) for lines in result.collab_lines[student].values()
-        )
-        c_alone = len(result.alone_commits[student])
-        c_collab = len(result.collab_commits[student])
+        total_alone = result.alone_line_totals[student]
+        total_collab = result.collab_line_totals[student]
+        c_alone = result.alone_commits[student].bit_count()
+        c_collab = result.collab_commits[student].bit_count()
 
         if has_gh and result.github_stats:
             gh = result.github_stats[student]
             pr_alone = fmt_pr(gh.prs_alone_merged, gh.prs_alone_open)
             pr_collab = fmt_pr(gh.prs_collab_merged, gh.prs_collab_open)
-            print(
+            lines.append(
                 f"{student.student_id:<3} {student.name:<{max_name_len}}  "
                 f"{pr_alone:>9}  {pr_collab:>10}  {gh.approvals_given:>8}  "
                 f"{c_alone:>8}  {c_collab:>9}  {total_alone:>8}  {total_collab:>9}"
             )
         else:
-            print(
+            lines.append(
                 f"{student.student_id:<3} {student.name:<{max_name_len}}  "
                 f"{c_alone:>8}  {c_collab:>9}  {total_alone:>8}  {total_collab:>9}"
             )
 
+    # One write for the whole table rather than one per row
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
 def _print_file_details(
-    repo: Repo,
     students_config: StudentsConfig,
     result: AnalysisResult,
 ) -> None:
     """Print the file details table and commits lookup."""
-    print()
-    print("File details:")
-    print("  A=Alone (no co-authors), C=Collab (with co-authors), number=line count")
+    lines: list[str] = []
+    lines.append("")
+    lines.append("File details:")
+    lines.append(
+        "  A=Alone (no co-authors), C=Collab (with co-authors), number=line count"
+    )
 
     student_ids = [s.student_id for s in students_config.students]
     col_width = 8
@@ -1930,41 +2942,35 @@ def _print_file_details(
 
     all_files = sorted(result.file_commits.keys())
 
-    max_filename_len = 4
+    # (directory with trailing slash or "", filename) per file; directories
+    # are interned so equal ones are the same object
+    splits: list[tuple[str, str]] = []
     for file_path in all_files:
-        if "/" in file_path:
-            filename = file_path.rsplit("/", 1)[1]
-        else:
-            filename = file_path
-        max_filename_len = max(max_filename_len, len(filename))
+        dir_path, sep, filename = file_path.rpartition("/")
+        splits.append((sys.intern(dir_path + sep), filename))
+
+    max_filename_len = max([4, *(len(filename) for _, filename in splits)])
 
     header_parts.extend([f"{'File':<{max_filename_len}}", "Commit"])
-    print(" ".join(header_parts))
-    print("-" * 80)
+    lines.append(" ".join(header_parts))
+    lines.append("-" * 80)
 
     current_dir: str | None = None
     all_commit_hashes: set[str] = set()
 
-    for file_path in all_files:
-        if "/" in file_path:
-            dir_path = file_path.rsplit("/", 1)[0] + "/"
-            filename = file_path.rsplit("/", 1)[1]
-        else:
-            dir_path = ""
-            filename = file_path
-
-        if dir_path != current_dir:
+    for file_path, (dir_path, filename) in zip(all_files, splits):
+        if dir_path is not current_dir:
             current_dir = dir_path
             if dir_path:
-                print(f"\n{dir_path}")
+                lines.append(f"\n{dir_path}")
 
         commits_for_file = sorted(result.file_commits[file_path])
         all_commit_hashes.update(commits_for_file)
 
         row_parts: list[str] = []
         for student in students_config.students:
-            a_count = len(result.alone_lines[student].get(file_path, []))
-            c_count = len(result.collab_lines[student].get(file_path, []))
+            a_count = result.alone_lines[student].get(file_path, 0)
+            c_count = result.collab_lines[student].get(file_path, 0)
             parts: list[str] = []
             if a_count > 0:
                 parts.append(f"A{a_count}")
@@ -1976,28 +2982,31 @@ def _print_file_details(
         # First row: student stats + filename + first commit
         first_commit = commits_for_file[0][:8] if commits_for_file else ""
         row_parts.extend([f"{filename:<{max_filename_len}}", first_commit])
-        print(" ".join(row_parts))
+        lines.append(" ".join(row_parts))
 
         # Additional rows: blank cells + blank filename + remaining commits
         blank_cells = " ".join([" " * col_width] * len(students_config.students))
         blank_filename = " " * max_filename_len
         for commit_hash in commits_for_file[1:]:
-            print(f"{blank_cells} {blank_filename} {commit_hash[:8]}")
+            lines.append(f"{blank_cells} {blank_filename} {commit_hash[:8]}")
 
     # Print commits lookup table
-    print()
-    print("Commits:")
-    print(f"{'Hash':<10} {'Date':<12} Message")
-    print("-" * 80)
+    lines.append("")
+    lines.append("Commits:")
+    lines.append(f"{'Hash':<10} {'Date':<12} Message")
+    lines.append("-" * 80)
 
-    commit_objects = [repo.get_commit(h) for h in all_commit_hashes]
+    # Every commit in the table was already read while collecting stats
+    commit_objects = [result.commits_by_hash[h] for h in all_commit_hashes]
     commit_objects.sort(key=lambda c: c.date, reverse=True)
 
     for commit in commit_objects:
-        msg = commit.message_lines[0] if commit.message_lines else ""
+        msg = commit.subject
         if len(msg) > 50:
             msg = msg[:50] + "..."
-        print(f"{commit.hash[:8]:<10} {commit.date:<12} {msg}")
+        lines.append(f"{commit.hash[:8]:<10} {commit.date:<12} {msg}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def init_repo(repo_path: str) -> None:
@@ -2058,17 +3067,21 @@ def init_repo(repo_path: str) -> None:
             print(f"  {f}", file=sys.stderr)
         sys.exit(1)
 
-    # Copy files
+    files_to_copy: list[tuple[str, Path]] = []
     for rel_path, src_file in all_files:
         if not src_file.exists():
             print(
                 f"Warning: Source file not found, skipping: {src_file}", file=sys.stderr
             )
             continue
+        files_to_copy.append((rel_path, src_file))
 
-        target_file = target / rel_path
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src_file, target_file)
+    # Copy files: create each directory once, then copy the bytes only
+    # (file metadata doesn't matter for these small text files)
+    for parent in {(target / rel_path).parent for rel_path, _ in files_to_copy}:
+        parent.mkdir(parents=True, exist_ok=True)
+    for rel_path, src_file in files_to_copy:
+        (target / rel_path).write_bytes(src_file.read_bytes())
         print(f"Created: {rel_path}")
 
     print()
@@ -2114,10 +3127,13 @@ def _init_user_templates(user_templates_dir: Path) -> None:
                 continue
             files_to_copy.append((rel_path, src_file))
 
+    # Create each directory once, then copy the bytes only
+    for parent in {
+        (user_templates_dir / rel_path).parent for rel_path, _ in files_to_copy
+    }:
+        parent.mkdir(parents=True, exist_ok=True)
     for rel_path, src_file in files_to_copy:
-        target_file = user_templates_dir / rel_path
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src_file, target_file)
+        (user_templates_dir / rel_path).write_bytes(src_file.read_bytes())
         print(f"Created template: {rel_path}")
 
     print()
@@ -2219,14 +3235,10 @@ def _annotate_pr(
         lines.append("|---:|------|---------|----------|---------|----------|")
 
     for student in students_config.students:
-        total_alone = sum(
-            len(lines_) for lines_ in result.alone_lines[student].values()
-        )
-        total_collab = sum(
-            len(lines_) for lines_ in result.collab_lines[student].values()
-        )
-        c_alone = len(result.alone_commits[student])
-        c_collab = len(result.collab_commits[student])
+        total_alone = result.alone_line_totals[student]
+        total_collab = result.collab_line_totals[student]
+        c_alone = result.alone_commits[student].bit_count()
+        c_collab = result.collab_commits[student].bit_count()
         if has_gh and result.github_stats:
             gh = result.github_stats[student]
             pr_alone = fmt_pr(gh.prs_alone_merged, gh.prs_alone_open)
@@ -2259,6 +3271,38 @@ def _annotate_pr(
         )
 
 
+_README_URL = "https://raw.githubusercontent.com/kc8se/datool/main/README.md"
+_README_CACHE_KEY = "readme:kc8se/datool"
+
+
+def iter_readme_chunks(chunk_size: int = 8192) -> Iterator[str]:
+    """
+    Stream the README.md from the GitHub repository.
+
+    Yields:
+        Decoded chunks of the README content, as they arrive
+
+    Raises:
+        ConnectionError: If the README cannot be fetched
+    """
+    # Fetch from GitHub (urllib is only imported on this rare path)
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(_README_URL, timeout=10) as response:
+            # Multi-byte characters may be split across chunks
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            while chunk := response.read(chunk_size):
+                if text := decoder.decode(chunk):
+                    yield text
+            if text := decoder.decode(b"", final=True):
+                yield text
+    except Exception as e:
+        raise ConnectionError(
+            f"Could not fetch README. Are you connected to the internet?\nDetails: {e}"
+        ) from e
+
+
 def fetch_readme() -> str:
     """
     Fetch the README.md from the GitHub repository.
@@ -2273,32 +3317,14 @@ def fetch_readme() -> str:
     """
     global _cache, _cache_dirty
 
-    cache_key = "readme:kc8se/datool"
-
     # Check cache first
-    if cache_key in _cache:
-        return _cache[cache_key]
-
-    # Fetch from GitHub
-    import urllib.error
-    import urllib.request
+    if _README_CACHE_KEY in _cache:
+        return _cache[_README_CACHE_KEY]
 
-    url = "https://raw.githubusercontent.com/kc8se/datool/main/README.md"
-
-    try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            content = response.read().decode("utf-8")
-    except urllib.error.URLError as e:
-        raise ConnectionError(
-            f"Could not fetch README. Are you connected to the internet?\nDetails: {e}"
-        ) from e
-    except Exception as e:
-        raise ConnectionError(
-            f"Could not fetch README. Are you connected to the internet?\nDetails: {e}"
-        ) from e
+    content = "".join(iter_readme_chunks())
 
     # Cache the result
-    _cache[cache_key] = content
+    _cache[_README_CACHE_KEY] = content
     _cache_dirty = True
 
     return content
@@ -2306,15 +3332,158 @@ def fetch_readme() -> str:
 
 def show_readme() -> None:
     """Fetch and display the README.md from GitHub."""
+    global _cache_dirty
+
     load_cache()
     setup_cache_handlers()
 
+    if _README_CACHE_KEY in _cache:
+        sys.stdout.write(_cache[_README_CACHE_KEY] + "\n")
+        return
+
+    # Write the README as it arrives, and only cache it once the whole
+    # transfer has succeeded
+    chunks: list[str] = []
     try:
-        readme = fetch_readme()
-        print(readme)
+        for chunk in iter_readme_chunks():
+            sys.stdout.write(chunk)
+            chunks.append(chunk)
     except ConnectionError as e:
+        sys.stdout.flush()
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    sys.stdout.write("\n")
+
+    _cache[_README_CACHE_KEY] = "".join(chunks)
+    _cache_dirty = True
+
+
+def analyze_repo(
+    repo: Repo, students_config: StudentsConfig, use_github: bool
+) -> AnalysisResult:
+    """
+    Collect line, commit and (optionally) GitHub statistics for a repository.
+
+    Args:
+        repo: The repository to analyze
+        students_config: The students configuration
+        use_github: Whether to collect GitHub PR statistics
+
+    Returns:
+        The collected statistics
+    """
+    ignored_authors = frozenset(students_config.ignore)
+
+    include_patterns = students_config.include_patterns or ["*"]
+    exclude_patterns = students_config.exclude_patterns or []
+
+    # Collect line and commit stats
+    result = _collect_all_stats(
+        repo, students_config, ignored_authors, include_patterns, exclude_patterns
+    )
+
+    # Collect GitHub stats if enabled
+    if use_github:
+        result.github_stats = _collect_github_stats(
+            repo, students_config, include_patterns, exclude_patterns
+        )
+
+    return result
+
+
+def _init_analysis_worker() -> None:
+    """Prepare a worker process of analyze_repos."""
+    # Only the parent process saves the cache; workers hand new entries back
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+    # Forked workers start with the parent's cache already in memory
+    if not _cache:
+        load_cache()
+
+
+def _analyze_repo_in_worker(
+    path: str, use_github: bool
+) -> tuple[AnalysisResult, dict[str, str]]:
+    """
+    Analyze a repository in a worker process of analyze_repos.
+
+    Args:
+        path: Path to the git repository
+        use_github: Whether to collect GitHub PR statistics
+
+    Returns:
+        The collected statistics, and the cache entries added while
+        collecting them
+    """
+    known_keys = set(_cache)
+    # Workers are reused across repositories; authors are per repository
+    Author.clear_registry()
+    repo = Repo(path)
+    try:
+        result = analyze_repo(repo, repo.get_students_config(), use_github)
+    finally:
+        repo.close()
+    # PRs are stored per repository, so workers never write the same file
+    _pr_cache.flush()
+    return result, {
+        key: value for key, value in _cache.items() if key not in known_keys
+    }
+
+
+def analyze_repos(
+    paths: list[str], jobs: int, use_github: bool
+) -> Iterator[tuple[Repo, StudentsConfig, AnalysisResult]]:
+    """
+    Analyze several repositories, up to `jobs` of them at once.
+
+    With more than one job, repositories are analyzed in worker processes;
+    the cache entries they add are merged into this process's cache, which
+    is the only one saved to disk.
+
+    Args:
+        paths: Paths to the git repositories
+        jobs: Maximum number of repositories to analyze in parallel
+        use_github: Whether to collect GitHub PR statistics
+
+    Yields:
+        (repo, students config, result) tuples, in the order of `paths`
+    """
+    global _cache_dirty
+
+    jobs = min(jobs, len(paths))
+    if jobs <= 1:
+        for path in paths:
+            # Authors (students, aliases, ignored) are per repository
+            Author.clear_registry()
+            repo = Repo(path)
+            try:
+                students_config = repo.get_students_config()
+                result = analyze_repo(repo, students_config, use_github)
+            finally:
+                # Stop this repository's git processes before the next one
+                repo.close()
+            yield repo, students_config, result
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_analysis_worker
+    ) as executor:
+        futures = [
+            executor.submit(_analyze_repo_in_worker, path, use_github) for path in paths
+        ]
+        for path, future in zip(paths, futures):
+            result, new_entries = future.result()
+            if new_entries:
+                with _cache_lock:
+                    _cache.update(new_entries)
+                    _cache_dirty = True
+            # Load the config here too, so the students' authors are known to
+            # this process when printing
+            Author.clear_registry()
+            repo = Repo(path)
+            yield repo, repo.get_students_config(), result
 
 
 def main() -> None:
@@ -2327,10 +3496,19 @@ def main() -> None:
         ),
     )
     parser.add_argument(
-        "repo",
-        nargs="?",
-        default=".",
-        help="Path to the git repository (default: current directory)",
+        "repos",
+        nargs="*",
+        default=["."],
+        metavar="repo",
+        help="Path to the git repository (default: current directory); "
+        "several repositories can be analyzed in one run",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of repositories to analyze in parallel (default: 1)",
     )
     parser.add_argument(
         "--clear-cache",
@@ -2365,6 +3543,11 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    if len(args.repos) > 1 and (args.init or args.annotate_pr):
+        parser.error("--init and --annotate-pr take a single repository")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     if args.readme:
         show_readme()
         sys.exit(0)
@@ -2374,7 +3557,7 @@ def main() -> None:
         sys.exit(0)
 
     if args.init:
-        init_repo(args.repo)
+        init_repo(args.repos[0])
         sys.exit(0)
 
     # Determine if GitHub stats should be collected
@@ -2386,45 +3569,30 @@ def main() -> None:
 
     repo: Repo | None = None
     try:
-        repo = Repo(args.repo)
+        if len(args.repos) > 1:
+            for index, (repo, students_config, result) in enumerate(
+                analyze_repos(args.repos, args.jobs, use_github)
+            ):
+                if index:
+                    print()
+                print(f"Repository: {repo.path}")
+                _print_summary(
+                    students_config,
+                    result,
+                    students_config.include_patterns or ["*"],
+                    students_config.exclude_patterns or [],
+                )
+                _print_file_details(students_config, result)
+            return
+
+        repo = Repo(args.repos[0])
         students_config = repo.get_students_config()
-        ignored_authors = set(students_config.ignore)
+        result = analyze_repo(repo, students_config, use_github)
 
         include_patterns = students_config.include_patterns or ["*"]
         exclude_patterns = students_config.exclude_patterns or []
-
-        # Collect line stats
-        alone_lines, collab_lines, file_commits, coauthors_cache = _collect_line_stats(
-            repo, students_config, ignored_authors, include_patterns, exclude_patterns
-        )
-
-        # Collect commit stats (uses commits found by line stats for consistency)
-        alone_commits, collab_commits = _collect_commit_stats(
-            repo,
-            students_config,
-            ignored_authors,
-            file_commits,
-            coauthors_cache,
-        )
-
-        # Collect GitHub stats if enabled
-        github_stats: GitHubStatsData | None = None
-        if use_github:
-            github_stats = _collect_github_stats(
-                repo, students_config, include_patterns, exclude_patterns
-            )
-
-        result = AnalysisResult(
-            alone_lines=alone_lines,
-            collab_lines=collab_lines,
-            alone_commits=alone_commits,
-            collab_commits=collab_commits,
-            file_commits=file_commits,
-            github_stats=github_stats,
-        )
-
         _print_summary(students_config, result, include_patterns, exclude_patterns)
-        _print_file_details(repo, students_config, result)
+        _print_file_details(students_config, result)
 
         if args.annotate_pr:
             pull_requests = repo.get_pull_requests()
@@ -0,0 +1,104 @@
+"""Tests for reusing cached git blame output across runs."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+DATOOL = Path(__file__).resolve().parent.parent / "datool.py"
+
+STUDENTS = {
+    "id": "619a9605-0e2b-45ee-ac51-a539c59d70bb",
+    "students": [
+        {
+            "id": "1",
+            "name": "Alice",
+            "email": "alice@example.com",
+            "github_username": "alice",
+        },
+        {
+            "id": "2",
+            "name": "Bob",
+            "email": "bob@example.com",
+            "github_username": "bob",
+        },
+    ],
+    "ignore": [{"name": "Teacher", "email": "teacher@example.com"}],
+    "files": {"include": ["*.py"], "exclude": []},
+}
+
+
+class BlameCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = Path(tmp.name) / "repo"
+        self.repo.mkdir()
+        self.env = dict(os.environ)
+        self.env["XDG_CACHE_HOME"] = str(Path(tmp.name) / "cache")
+        self.env.pop("GITHUB_ACTIONS", None)
+
+    def git(self, *args: str, author: str = "Teacher") -> None:
+        subprocess.run(
+            [
+                "git",
+                "-C",
+                str(self.repo),
+                "-c",
+                f"user.name={author}",
+                "-c",
+                f"user.email={author.lower()}@example.com",
+                *args,
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+    def student_rows(self) -> dict[str, list[str]]:
+        """Run datool and return the summary columns per student name."""
+        result = subprocess.run(
+            [sys.executable, str(DATOOL), str(self.repo)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=self.env,
+        )
+        rows: dict[str, list[str]] = {}
+        summary = result.stdout.partition("File details:")[0]
+        for line in summary.splitlines():
+            parts = line.split()
+            if parts and parts[0] in ("1", "2"):
+                rows[parts[1]] = parts[2:]
+        return rows
+
+    def test_not_reused_across_branches(self) -> None:
+        """Identical files on two branches are credited to each branch's author."""
+        self.git("init", "-q", "-b", "main")
+        (self.repo / ".students.json").write_text(json.dumps(STUDENTS))
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "Add config")
+
+        for branch, author in (("x", "Alice"), ("y", "Bob")):
+            self.git("checkout", "-q", "-b", branch, "main")
+            (self.repo / "f.py").write_text("def f():\n    return 1\n")
+            self.git("add", "f.py")
+            self.git("commit", "-q", "-m", "Add f", author=author)
+
+        # Warm the cache on branch x, then analyze branch y
+        self.git("checkout", "-q", "x")
+        self.assertEqual(
+            self.student_rows(),
+            {"Alice": ["1", "0", "2", "0"], "Bob": ["0", "0", "0", "0"]},
+        )
+        self.git("checkout", "-q", "y")
+        self.assertEqual(
+            self.student_rows(),
+            {"Alice": ["0", "0", "0", "0"], "Bob": ["1", "0", "2", "0"]},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()